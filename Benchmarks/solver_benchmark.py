@@ -0,0 +1,283 @@
+"""
+Convergence and mesh independence benchmarks of the solvers.
+
+Runs the reaction force, internal load, torque and shear flow stages over a range of mesh sizes and records the
+wall time, peak traced memory, solver iterations and error against the analytic (direct solver) or finest mesh
+reference of every stage, in a JSON report. Runs offline, from the repository root:
+
+    python -m Benchmarks.solver_benchmark --out benchmark_report.json
+    python -m Benchmarks.solver_benchmark --sizes 100 1000 10000 --baseline benchmark_report.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import src.force_calculations_v2 as fc
+from src.analysis import reaction_forces
+from src.class_CONFIG import get_config
+from src.class_SLICE import Rib, Hinged_slice
+from src.class_SPAN import SpanModel
+from src.internal_load_calculations import internal_load_calc
+from src.moment_calculations import moment_calc
+from src.shear_flow_calculations import section_loads, shear_flow_calc
+from src.tools_cache import cache_key
+from src.tools_mesh import adaptive_mesh
+
+# CONSTANTS #
+SIZES = [10**2, 10**3, 10**4, 10**5, 10**6]
+REPORT_VERSION = 1
+
+
+def measure(function, *args, repeat=1, **kwargs):
+    """
+    Run function(*args, **kwargs), timing the best of repeat runs, then once more with tracemalloc to record
+    the peak memory allocated during the call (NumPy arrays included).
+
+    :return: Result of the function, wall time (s), peak memory (bytes)
+    """
+    wall_time = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        wall_time = min(wall_time, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return result, wall_time, peak_memory
+
+
+def _record(stage, mesh, n, wall_time, peak_memory, iterations=None, error=None):
+    return {"stage": stage, "mesh": mesh, "n": int(n), "wall_time": wall_time, "peak_memory": int(peak_memory),
+            "iterations": iterations or {}, "error": error or {}}
+
+
+# --- Stages
+
+def _solve_reactions(cfg, n_steps=None, x_pos=None):
+    y_solution = {}
+    z_solution = {}
+    FY = fc.Y_force(n_steps=n_steps, plot=False, info=False, ret=True, method="iterative", cfg=cfg, x_pos=x_pos,
+                    solution=y_solution)
+    FZ = fc.Z_force(FY, n_steps=n_steps, plot=False, info=False, ret=True, method="iterative", cfg=cfg, x_pos=x_pos,
+                    solution=z_solution)
+    return FY, FZ, y_solution, z_solution
+
+
+def benchmark_reactions(cfg, n_steps=None, x_pos=None, repeat=1):
+    """
+    Benchmark the iterative reaction force solvers on the uniform grid of n_steps steps, or on the stations x_pos,
+    against the direct solvers and the closed form tip deflections.
+
+    :return: Benchmark record (dictionary)
+    """
+    (FY, FZ, y_solution, z_solution), wall_time, peak_memory = measure(_solve_reactions, cfg, n_steps, x_pos,
+                                                                       repeat=repeat)
+    FY_ref, FZ_ref = reaction_forces(cfg, method="direct", cache=False)
+
+    # --- The last station of the uniform grid can lie up to 1 mm past the tip (see Y_force)
+    x_tip = y_solution["x_pos"][-1]
+
+    error = {"FY": float(np.max(np.abs(np.subtract(FY, FY_ref)))/np.max(np.abs(FY_ref))),
+             "FZ": float(np.max(np.abs(np.subtract(FZ, FZ_ref)))/np.max(np.abs(FZ_ref))),
+             "tip_y": float(abs(y_solution["disp"][-1] - fc.Y_deflection(x_tip, cfg))),
+             "tip_z": float(abs(z_solution["disp"][-1] - fc.Z_deflection(x_tip, cfg)))}
+    iterations = {"y": int(y_solution["iterations"]), "z": int(z_solution["iterations"]),
+                  "y_final_error": float(y_solution["error"]), "z_final_error": float(z_solution["error"])}
+
+    return _record("reactions", "uniform" if x_pos is None else "adaptive", len(y_solution["x_pos"]),
+                   wall_time, peak_memory, iterations, error)
+
+
+def _span(cfg, nb_of_slices, fy, fz):
+    fx = [0, 0, 0, 0, 0]
+    features = [Rib("A", cfg.x1, deflection=cfg.d1, x_load=fx[0], y_load=fy[0], z_load=fz[0], cfg=cfg),
+                Rib("B", cfg.x2-(cfg.xa/2), x_load=fx[1], y_load=fy[1], z_load=fz[1], cfg=cfg),
+                Hinged_slice(1, cfg.x2, x_load=fx[2], y_load=fy[2], z_load=fz[2], cfg=cfg),
+                Rib("C", cfg.x2+(cfg.xa/2), x_load=fx[3], y_load=fy[3], z_load=fz[3], cfg=cfg),
+                Rib("D", cfg.x3, deflection=cfg.d3, x_load=fx[4], y_load=fy[4], z_load=fz[4], cfg=cfg)]
+    return SpanModel.from_features(features, cfg.la, nb_of_slices, cfg=cfg)
+
+
+def _internal_loads(span):
+    span.y_internal_load, span.z_internal_load, span.y_internal_moment, span.z_internal_moment = \
+        internal_load_calc(span.x_location, span.feature_x_location, span.feature_y_load, span.feature_z_load,
+                           span.cfg.q)
+    return span
+
+
+def _torque(span, fy, fz):
+    torque, theta_deg = moment_calc(fy, fz, span.x_separation, span.feature_index, span.cfg)
+    span.x_torque[:] = torque
+    span.displacement_theta[:] = theta_deg
+    return span
+
+
+def _shear_flows(span):
+    rib_k = [k for k in range(len(span.feature_index)) if span.feature_types[k] is Rib]
+    rib_index = span.feature_index[rib_k]
+
+    Sy, Sz, My, Mz = section_loads(span.y_internal_load[rib_index], span.z_internal_load[rib_index],
+                                   span.y_internal_moment[rib_index], span.z_internal_moment[rib_index],
+                                   span.cfg.theta)
+    q1, q2, _, _ = shear_flow_calc(span.cross_section, Sy, Sz, My, Mz, span.x_torque[rib_index])
+    panel_shear_flow = span.shear_flow_field()
+
+    return q1, q2, np.max(np.abs(panel_shear_flow))
+
+
+def _span_results(span):
+    q1, q2, max_panel_shear_flow = _shear_flows(span)
+    return {"max_y_internal_moment": np.max(np.abs(span.y_internal_moment)),
+            "max_z_internal_moment": np.max(np.abs(span.z_internal_moment)),
+            "tip_twist": span.displacement_theta[-1],
+            "rib_q1": q1, "rib_q2": q2, "max_panel_shear_flow": max_panel_shear_flow}
+
+
+def _relative_errors(results, reference):
+    return {name: float(np.max(np.abs(np.subtract(results[name], reference[name])))/np.max(np.abs(reference[name])))
+            for name in reference}
+
+
+def benchmark_span(cfg, nb_of_slices, fy, fz, reference=None, repeat=1):
+    """
+    Benchmark the span stages (internal loads, torque and twist, rib and skin shear flows) on a uniform grid of
+    nb_of_slices simple slices.
+
+    :param fy, fz: Reaction forces (see reaction_forces)
+    :param reference: Results of the finest span (see _span_results), None for no error estimate
+    :return: List of benchmark records (one per stage), results of the span
+    """
+    span, construction_time, construction_memory = measure(_span, cfg, nb_of_slices, fy, fz, repeat=repeat)
+    _, load_time, load_memory = measure(_internal_loads, span, repeat=repeat)
+    _, torque_time, torque_memory = measure(_torque, span, fy, fz, repeat=repeat)
+    _, shear_time, shear_memory = measure(_shear_flows, span, repeat=repeat)
+
+    results = _span_results(span)
+    error = _relative_errors(results, reference) if reference is not None else {}
+
+    records = [_record("span_construction", "uniform", len(span), construction_time, construction_memory),
+               _record("internal_loads", "uniform", len(span), load_time, load_memory,
+                       error={name: error[name] for name in error if "internal" in name}),
+               _record("torque", "uniform", len(span), torque_time, torque_memory,
+                       error={name: error[name] for name in error if "twist" in name}),
+               _record("shear_flow", "uniform", len(span), shear_time, shear_memory,
+                       error={name: error[name] for name in error if "q" in name or "shear" in name})]
+
+    return records, results
+
+
+def run_benchmarks(cfg=None, sizes=SIZES, repeat=1, verbose=False):
+    """
+    Run the benchmark suite over the mesh sizes: the iterative reaction solvers with n_steps = size, the span stages
+    with nb_of_slices = size (errors against the largest size), and the reaction solvers on the default adaptive
+    mesh.
+
+    :param cfg: AileronConfig (current values in config.py by default)
+    :param sizes: Mesh sizes (number of integration steps and of simple slices)
+    :param repeat: Number of timed runs of every stage (best time recorded)
+    :return: Report dictionary (JSON serialisable)
+    """
+    cfg = get_config(cfg)
+    sizes = sorted(int(size) for size in sizes)
+
+    # --- Warm up the geometry caches, so the first size does not pay for the cross-section
+    fc.solver_constants(cfg)
+    fy, fz = reaction_forces(cfg, method="direct", cache=False)
+
+    records = []
+    for n_steps in sizes:
+        records.append(benchmark_reactions(cfg, n_steps=n_steps, repeat=repeat))
+        if verbose:
+            _print_record(records[-1])
+    records.append(benchmark_reactions(cfg, x_pos=adaptive_mesh(cfg), repeat=repeat))
+    if verbose:
+        _print_record(records[-1])
+
+    # --- Span stages, finest grid first as the reference
+    span_records = {}
+    reference = None
+    for nb_of_slices in reversed(sizes):
+        span_records[nb_of_slices], results = benchmark_span(cfg, nb_of_slices, fy, fz, reference, repeat=repeat)
+        if reference is None:
+            reference = results
+    for nb_of_slices in sizes:
+        records.extend(span_records[nb_of_slices])
+        if verbose:
+            for record in span_records[nb_of_slices]:
+                _print_record(record)
+
+    return {"version": REPORT_VERSION,
+            "config_hash": cache_key(cfg),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "sizes": sizes,
+            "repeat": repeat,
+            "records": records}
+
+
+def compare_reports(report, baseline, tolerance=1.5):
+    """
+    Find the stages that got slower than the baseline report by more than a factor tolerance.
+
+    :return: List of (stage, mesh, n, time ratio) tuples
+    """
+    baseline_time = {(record["stage"], record["mesh"], record["n"]): record["wall_time"]
+                     for record in baseline["records"]}
+
+    regressions = []
+    for record in report["records"]:
+        key = (record["stage"], record["mesh"], record["n"])
+        if key in baseline_time and record["wall_time"] > tolerance*baseline_time[key]:
+            regressions.append(key + (record["wall_time"]/baseline_time[key],))
+
+    return regressions
+
+
+def _print_record(record):
+    error = ", ".join(name + " " + "%.2e" % value for name, value in record["error"].items())
+    iterations = ", ".join(name + " " + str(value) for name, value in record["iterations"].items()
+                           if isinstance(value, int))
+    print("%-18s %-8s n = %-8d %9.4f s %9.2f MB  %s  %s" % (record["stage"], record["mesh"], record["n"],
+                                                          record["wall_time"], record["peak_memory"]/1024**2,
+                                                          iterations, error))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convergence and mesh independence benchmarks of the solvers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="mesh sizes (default 10^2 to 10^6)")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per stage, best time is recorded")
+    parser.add_argument("--out", default="benchmark_report.json", help="JSON report path")
+    parser.add_argument("--baseline", help="JSON report to check for performance regressions")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="slowdown factor reported as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(sizes=args.sizes, repeat=args.repeat, verbose=True)
+
+    with open(args.out, "w") as file:
+        json.dump(report, file, indent=2)
+    print("Benchmark report written to " + args.out)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare_reports(report, json.load(file), args.tolerance)
+        for stage, mesh, n, ratio in regressions:
+            print("Regression: %s (%s, n = %d) %.2f times slower than the baseline" % (stage, mesh, n, ratio))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,20 @@
 from src.tools_plot import *
 
-import src.force_calculations_v2 as fc
+from src.analysis import reaction_forces
 
 from src.class_SLICE import *
 
-from config import *
-# ============================================ Calculate reaction forces iteratively
+from src.class_SPAN import SpanModel
+
+from src.internal_load_calculations import internal_load_calc
 
+from config import *
 
-def reaction_forces():
-    FY = fc.Y_force(n_steps=10000, plot=False, info=False, ret=True)
-    FZ = fc.Z_force(FY, n_steps=10000, plot=False, info=False, ret=True)
-    return FY, FZ
+from math import pi
 
-fy, fz = reaction_forces()
+import numpy as np
+# ============================================ Calculate reaction forces (or load them from the result cache)
+fy, fz = reaction_forces(n_steps=10000, method="direct")
 # print("fy", fy)
 # print("fz", fz)
 fx = [0, 0, 0, 0, 0]
@@ -22,144 +23,81 @@ print("\n=========================================================")
 print("                 Reaction forces found!")
 print("=========================================================\n")
 
-# ============================================ Define basic model generation parameters
-slice_interval = la/(nb_of_slices-1)
-
-# _________________________________ Gen. initial aileron discretisation
-model = list()
-
-# --------- Adding ribs and hinged slice to model and setting actuator status
-model.append(Rib("A", x1, deflection=d1, x_load=fx[0], y_load=fy[0], z_load=fz[0]))
-model.append(Rib("B", x2-(xa/2), x_load=fx[1], y_load=fy[1], z_load=fz[1]))
-
-model.append(Hinged_slice(1, x2, x_load=fx[2], y_load=fy[2], z_load=fz[2]))
-
-model.append(Rib("C", x2+(xa/2), x_load=fx[3], y_load=fy[3], z_load=fz[3]))
-model.append(Rib("D", x3, deflection=d3, x_load=fx[4], y_load=fy[4], z_load=fz[4]))
+# ============================================ Gen. initial aileron discretisation
+# --------- Defining ribs and hinged slice and setting actuator status
+features = [Rib("A", x1, deflection=d1, x_load=fx[0], y_load=fy[0], z_load=fz[0]),
+            Rib("B", x2-(xa/2), x_load=fx[1], y_load=fy[1], z_load=fz[1]),
+            Hinged_slice(1, x2, x_load=fx[2], y_load=fy[2], z_load=fz[2]),
+            Rib("C", x2+(xa/2), x_load=fx[3], y_load=fy[3], z_load=fz[3]),
+            Rib("D", x3, deflection=d3, x_load=fx[4], y_load=fy[4], z_load=fz[4])]
 
-# --------- Adding simple slices to model
-loc = 0
-for i in range(nb_of_slices):
-    model.append(Simple_slice(i+1, loc))
-    loc += slice_interval
+# --------- Merging features into a uniform grid of simple slices (sorted by x position)
+span = SpanModel.from_features(features, la, nb_of_slices)
 
-# --------- Sort model points according to x position:
-n_times = len(model)
-# Traverse all list elements
-for i in range(n_times):
-    for j in range(0, n_times-i-1):
-        # traverse the list from 0 to n-i-1 (e.g number of possible swap left)
-        if model[j].x_location > model[j+1].x_location:
-            model[j], model[j+1] = model[j+1], model[j]
-
-# --------- List all x positions
-x_lst = []
-for i in range(len(model)):
-    x_lst.append(model[i].x_location)
+x_lst = span.x_location
 
 # _________________________________ Calculate internal forces in every slice
-features = []
-feature_index = []
-x_separation = []
-
-count = 0
-for i in range(len(model)-1):
-    count += 1
-    x_separation.append(model[i+1].x_location-model[i].x_location)
-
-for i in range(len(model)):
-    if type(model[i]) is not Simple_slice:
-        features.append(model[i])
-        feature_index.append(i)
-
-# --- Calc. y/z internal forces and z internal moment
-for i in range(len(model)-1):
-    model[i+1].y_internal_load = -(-model[i].y_internal_load + model[i+1].y_load + -q*(model[i+1].x_location - model[i].x_location))
-    model[i+1].z_internal_load = -(-model[i].z_internal_load + model[i+1].z_load)
-
-    fy1 = 0
-    fz1 = 0
-
-    fy2 = 0
-    fz2 = 0
+x_separation = span.x_separation
+feature_index = span.feature_index
+feature_x = span.feature_x_location
 
-    fy3 = 0
-    fz3 = 0
-
-    fy4 = 0
-    fz4 = 0
-
-    fy5 = 0
-    fz5 = 0
-
-    if model[i+1].x_location > features[0].x_location:
-        fy1 = features[0].y_load
-        fz1 = features[0].z_load
-
-    if model[i+1].x_location > features[1].x_location:
-        fy2 = features[1].y_load
-        fz2 = features[1].z_load
-
-    if model[i+1].x_location > features[2].x_location:
-        fy3 = features[2].y_load
-        fz3 = features[2].z_load
-
-    if model[i+1].x_location > features[3].x_location:
-        fy4 = features[3].y_load
-        fz4 = features[3].z_load
-
-    if model[i+1].x_location > features[4].x_location:
-        fy5 = features[4].y_load
-        fz5 = features[4].z_load
-
-    model[i+1].y_internal_moment = -(fy1*(model[i+1].x_location - features[0].x_location)
-                                     + fy2 * (model[i + 1].x_location - features[1].x_location)
-                                     + fy3 * (model[i + 1].x_location - features[2].x_location)
-                                     + fy4 * (model[i + 1].x_location - features[3].x_location)
-                                     + fy5 * (model[i + 1].x_location - features[4].x_location)
-                                     - (q*model[i+1].x_location)*(model[i+1].x_location/2))
-
-    model[i+1].z_internal_moment = -(fz1*(model[i+1].x_location - features[0].x_location)
-                                     + fz2 * (model[i + 1].x_location - features[1].x_location)
-                                     + fz3 * (model[i + 1].x_location - features[2].x_location)
-                                     + fz4 * (model[i + 1].x_location - features[3].x_location)
-                                     + fz5 * (model[i + 1].x_location - features[4].x_location))
+# --- Calc. y/z internal forces and y/z internal moments
+span.y_internal_load, span.z_internal_load, span.y_internal_moment, span.z_internal_moment = \
+    internal_load_calc(x_lst, feature_x, span.feature_y_load, span.feature_z_load, q)
 
 # --- Calc. internal torque
 from src.moment_calculations import moment_calc
 
 torque_lst, theta_lst = moment_calc(fy, fz, x_separation, feature_index)
 
-for i in range(len(model)-1):
-    model[i+1].x_torque = torque_lst[i]
-    model[i+1].displacement_theta = theta_lst[i]
+span.x_torque[:] = torque_lst
+span.displacement_theta[:] = theta_lst
 
 
 # --- List results
-f_internal_y = []
-f_internal_z = []
-m_internal_y = []
-m_internal_z = []
-x_torque = []
+f_internal_y = span.y_internal_load
+f_internal_z = span.z_internal_load
 
-for slice_point in model:
-    f_internal_y.append(slice_point.y_internal_load)
-    f_internal_z.append(slice_point.z_internal_load)
+m_internal_y = span.y_internal_moment
+m_internal_z = span.z_internal_moment
 
-    m_internal_y.append(slice_point.y_internal_moment)
-    m_internal_z.append(slice_point.z_internal_moment)
+x_torque = span.x_torque
 
-    x_torque.append(slice_point.x_torque)
+# --- Leading/trailing edge deflections (y direction)
+deflection = span.deflection()
+le_deflection = deflection.le_y
+te_deflection = deflection.te_y
 
 # ============================================ Calc. internal shear
-for i in range(len(model)-1):
-    if type(model[i+1]) is Rib:
-        model[i+1].calc_shear_flow()
+ribs = []
+for k in range(len(span.feature_index)):
+    if span.feature_types[k] is Rib:
+        ribs.append(span.feature_slice(k))
+        ribs[-1].calc_shear_flow()
 
 print("Shear flow values:")
-for i in range(len(model)-1):
-    if type(model[i+1]) is Rib:
-        print("Shear flow in rib "+model[i+1].label+" (N/mm): q1 = "+str(round(model[i+1].q1))+", q2 = "+str(round(model[i+1].q2)))
+for rib in ribs:
+    print("Shear flow in rib "+rib.label+" (N/mm): q1 = "+str(round(rib.q1))+", q2 = "+str(round(rib.q2)))
+
+# --------- Skin shear flow along the whole span (stations x panels)
+panel_shear_flow = span.shear_flow_field()
+i_max, p_max = np.unravel_index(np.argmax(np.abs(panel_shear_flow)), panel_shear_flow.shape)
+print("Maximum skin shear flow (N/mm):", round(panel_shear_flow[i_max, p_max], 3),
+      "at x =", round(x_lst[i_max], 1), length_unit)
+
+# --------- Direct stress in every boom along the whole span (stations x booms)
+from src.stress_calculations import stress_peaks
+
+direct_stress = span.direct_stress_field()
+for name, peak in zip(["Maximum", "Minimum"], stress_peaks(direct_stress, x_lst)):
+    print(name, "direct stress (N/mm^2):", round(peak.value, 3), "in boom", peak.boom,
+          "at x =", round(peak.x_location, 1), length_unit)
+
+# --------- Von Mises stress at every boom and panel, streamed by blocks of stations
+for block in span.von_mises_blocks(block_size=500):
+    von_mises_peak = block.peak
+print("Maximum Von Mises stress (N/mm^2):", round(von_mises_peak.value, 3), "at stress point", von_mises_peak.boom,
+      "at x =", round(von_mises_peak.x_location, 1), length_unit)
 
 
 # ============================================ Print/Plot functions
@@ -220,10 +158,10 @@ plot_internal_forces(m_internal_z, "z moment")
 test_slice.plot_boom_structure()
 
 # --------- Plot aileron model structure
-# plot_3d_aileron(model)
+# plot_3d_aileron(span)
 
 # --------- Plot leading/trailing edge deflections
-# plot_le_te_deflection(le_deflection, te_deflection, x_lst)
+plot_le_te_deflection(le_deflection, te_deflection, x_lst)
 
 
 
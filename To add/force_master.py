@@ -1,10 +1,10 @@
 import src.force_calculations_v2 as fc
 import src.moment_calculations as mc
 
+from src.analysis import reaction_forces as cached_reaction_forces
+
 def reaction_forces():
-    FY = fc.Y_force(n_steps=10000, plot=False, info=False, ret=True)
-    FZ = fc.Z_force(FY, n_steps=10000, plot=False, info=False, ret=True)
-    return(FY,FZ)
+    return cached_reaction_forces(n_steps=10000, method="iterative")
     
 def torque_calc():
     FY,FZ = reaction_forces()
@@ -0,0 +1,21 @@
+import json
+
+
+def test_run_benchmarks():
+    from Benchmarks.solver_benchmark import run_benchmarks, compare_reports
+
+    report = run_benchmarks(sizes=[100, 1000])
+    json.dumps(report)
+
+    stages = [(record["stage"], record["mesh"]) for record in report["records"]]
+    assert stages.count(("reactions", "uniform")) == 2
+    assert ("reactions", "adaptive") in stages
+    assert stages.count(("shear_flow", "uniform")) == 2
+
+    reactions = [record for record in report["records"] if record["stage"] == "reactions"]
+    assert all(record["iterations"]["y"] > 0 and record["wall_time"] > 0 for record in reactions)
+    assert reactions[1]["error"]["FY"] < reactions[0]["error"]["FY"]
+
+    # --- Same report as baseline: no regression
+    assert compare_reports(report, report) == []
+    assert len(compare_reports(report, report, tolerance=0.)) == len(report["records"])
@@ -0,0 +1,93 @@
+import os
+
+
+def test_cache_store_load_evict(tmp_path):
+    import numpy as np
+    from src.tools_cache import cache_key, cache_load, cache_store, cache_evict
+
+    key_a = cache_key("a", 1, 2.5)
+    key_b = cache_key("b", 1, 2.5)
+    assert key_a == cache_key("a", 1, 2.5) and key_a != key_b
+
+    assert cache_load(key_a, str(tmp_path)) is None
+
+    cache_store(key_a, {"x": np.arange(1000.)}, str(tmp_path))
+    os.utime(tmp_path / (key_a + ".npz"), (0, 0))
+    cache_store(key_b, {"x": np.arange(1000.)}, str(tmp_path))
+
+    assert list(cache_load(key_b, str(tmp_path))["x"]) == list(np.arange(1000.))
+
+    # --- Least recently used entry evicted first
+    entry_size = os.path.getsize(tmp_path / (key_b + ".npz"))
+    cache_evict(str(tmp_path), size_limit=entry_size)
+    assert cache_load(key_a, str(tmp_path)) is None
+    assert cache_load(key_b, str(tmp_path)) is not None
+
+
+def test_cached_reaction_forces(tmp_path, monkeypatch):
+    import src.tools_cache as tools_cache
+    import src.force_calculations_v2 as fc
+    from src.analysis import reaction_forces
+    from src.class_CONFIG import AileronConfig
+
+    monkeypatch.setattr(tools_cache, "CACHE_DIR", str(tmp_path))
+
+    cfg = AileronConfig.from_module()
+    FY, FZ = reaction_forces(cfg, cache=True)
+    assert len(os.listdir(tmp_path)) == 1
+
+    # --- Second call does not solve
+    monkeypatch.setattr(fc, "Y_force", None)
+    assert reaction_forces(cfg, cache=True) == (FY, FZ)
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_reaction_forces_cache_key(tmp_path, monkeypatch):
+    import src.tools_cache as tools_cache
+    import src.force_calculations_v2 as fc
+    from src.analysis import reaction_forces
+    from src.class_CONFIG import AileronConfig
+
+    monkeypatch.setattr(tools_cache, "CACHE_DIR", str(tmp_path))
+
+    cfg = AileronConfig.from_module()
+    reaction_forces(cfg, cache=True)
+
+    # --- Values not read by the solvers share the entry, solver inputs do not
+    reaction_forces(cfg.replace(nb_of_slices=cfg.nb_of_slices + 1), cache=True)
+    assert len(os.listdir(tmp_path)) == 1
+    reaction_forces(cfg.replace(tsk=cfg.tsk + 0.1), cache=True)
+    assert len(os.listdir(tmp_path)) == 2
+
+    # --- n_steps only matters to the iterative method
+    reaction_forces(cfg, n_steps=500, method="direct", cache=True)
+    assert len(os.listdir(tmp_path)) == 2
+    reaction_forces(cfg, n_steps=500, method="iterative", cache=True)
+    reaction_forces(cfg, n_steps=600, method="iterative", cache=True)
+    assert len(os.listdir(tmp_path)) == 4
+
+    # --- A new solver version does not reuse the entries
+    monkeypatch.setattr(fc, "SOLVER_VERSION", fc.SOLVER_VERSION + 1)
+    reaction_forces(cfg, cache=True)
+    assert len(os.listdir(tmp_path)) == 5
+
+
+def test_cached_iterative_deflection(tmp_path, monkeypatch):
+    import numpy as np
+    import src.tools_cache as tools_cache
+    import src.force_calculations_v2 as fc
+    from src.analysis import run_analysis
+    from src.class_CONFIG import AileronConfig
+
+    monkeypatch.setattr(tools_cache, "CACHE_DIR", str(tmp_path))
+
+    cfg = AileronConfig.from_module()
+    results = run_analysis(cfg, nb_of_slices=200, n_steps=2000, method="iterative", cache=True)
+
+    # --- The hinge line deflection comes with the cached reaction forces, the solvers do not run again
+    monkeypatch.setattr(fc, "Y_force", None)
+    monkeypatch.setattr(fc, "Z_force", None)
+    cached = run_analysis(cfg, nb_of_slices=200, n_steps=2000, method="iterative", cache=True)
+    assert np.array_equal(cached["deflection_hinge_y"], results["deflection_hinge_y"])
+    assert np.array_equal(cached["deflection_te_z"], results["deflection_te_z"])
+    assert len(os.listdir(tmp_path)) == 1
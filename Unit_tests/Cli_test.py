@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_run_headless(tmp_path):
+    out = str(tmp_path / "results.npz")
+    script = ("import sys, svv\n"
+              "code = svv.main(['run', '--out', " + repr(out) + ", '--slices', '200', '--no-cache', '--quiet'])\n"
+              "sys.exit(code + 10*('matplotlib' in sys.modules))\n")
+
+    completed = subprocess.run([sys.executable, "-c", script], cwd=ROOT)
+    assert completed.returncode == 0
+
+    with np.load(out) as results:
+        assert len(results["x_location"]) == 205
+        assert list(results["rib_labels"]) == ["A", "B", "C", "D"]
+        assert results["max_panel_shear_flow"] > 0
+        assert "panel_shear_flow" not in results
+
+
+def test_run_not_converged(tmp_path, monkeypatch):
+    import svv
+    import src.force_calculations_v2 as fc
+
+    monkeypatch.setattr(fc, "MAX_ITERATIONS", 2)
+    code = svv.main(["run", "--out", str(tmp_path / "results.npz"), "--method", "iterative", "--n-steps", "200",
+                     "--no-cache", "--quiet"])
+
+    assert code == 1
+    assert not os.path.exists(tmp_path / "results.npz")
+
+
+def test_run_even_stringer_count(tmp_path):
+    import pytest
+    import svv
+
+    with pytest.raises(SystemExit) as exit_info:
+        svv.main(["run", "--out", str(tmp_path / "results.npz"), "--set", "nst=14", "--no-cache", "--quiet"])
+
+    assert exit_info.value.code == 2
+    assert not os.path.exists(tmp_path / "results.npz")
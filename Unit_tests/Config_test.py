@@ -0,0 +1,57 @@
+import pytest
+
+
+def test_config_from_module():
+    import config
+    from src.class_CONFIG import AileronConfig
+
+    cfg = AileronConfig.from_module()
+
+    assert cfg.ca == config.ca and cfg.nst == config.nst
+    assert cfg == AileronConfig.from_module(config)
+    assert hash(cfg) == hash(AileronConfig.from_module(config))
+
+    with pytest.raises(AttributeError):
+        cfg.tsk = 2
+
+    with pytest.raises(ValueError):
+        cfg.replace(not_a_variable=1)
+
+
+def test_explicit_configs():
+    import src.force_calculations_v2 as fc
+    from src.class_CONFIG import AileronConfig
+    from src.class_SLICE import Rib
+    from src.moment_calculations import moment_calc
+
+    cfg = AileronConfig.from_module()
+    thick = cfg.replace(tsk=2*cfg.tsk, tsp=2*cfg.tsp)
+
+    assert Rib("A", 0, cfg=thick).cross_section is not Rib("A", 0, cfg=cfg).cross_section
+    assert Rib("A", 0, cfg=thick).cross_section is Rib("B", 10, cfg=thick).cross_section
+
+    FY = fc.Y_force(plot=False, info=False, ret=True, method="direct", cfg=cfg)
+    FY_thick = fc.Y_force(plot=False, info=False, ret=True, method="direct", cfg=thick)
+    FZ_thick = fc.Z_force(FY_thick, plot=False, info=False, ret=True, method="direct", cfg=thick)
+    assert FY_thick != FY
+
+    torque, theta_deg = moment_calc(FY_thick, FZ_thick, [1.]*20, [2, 5, 8, 11, 14], thick)
+    assert theta_deg[5] == pytest.approx(thick.theta)
+
+    # --- Default configuration unchanged
+    assert fc.Y_force(plot=False, info=False, ret=True, method="direct") == FY
+
+
+def test_stringer_count_validation():
+    from src.class_CONFIG import AileronConfig, MIN_STRINGERS
+    from src.class_CROSS_SECTION import Cross_section
+
+    cfg = AileronConfig.from_module()
+
+    for nst in [14, 1, MIN_STRINGERS-2, 15.5]:
+        with pytest.raises(ValueError):
+            cfg.replace(nst=nst)
+    with pytest.raises(ValueError):
+        Cross_section(cfg.ca, cfg.ha, cfg.tsk, cfg.tsp, cfg.tst, cfg.hst, cfg.wst, 14, cfg.theta)
+
+    assert cfg.replace(nst=MIN_STRINGERS).nst == MIN_STRINGERS
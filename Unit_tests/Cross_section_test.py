@@ -0,0 +1,81 @@
+import pytest
+
+
+def test_slices_share_cross_section():
+    from src.class_SLICE import Simple_slice, Rib
+
+    slice_1 = Simple_slice(1, 0)
+    slice_2 = Simple_slice(2, 100)
+    rib = Rib("A", 172)
+
+    assert slice_1.cross_section is slice_2.cross_section
+    assert rib.cross_section is slice_1.cross_section
+    assert rib.I_zz == slice_1.cross_section.I_zz
+
+
+def test_cross_section_cache_invalidation(monkeypatch):
+    import config
+    from src.class_CROSS_SECTION import get_cross_section
+
+    reference = get_cross_section()
+
+    monkeypatch.setattr(config, "tsk", 2 * config.tsk)
+    thicker = get_cross_section()
+
+    assert thicker is not reference
+    assert thicker.u_centroid != reference.u_centroid
+
+    monkeypatch.undo()
+    assert get_cross_section() is reference
+
+
+def test_cross_section_immutable():
+    from src.class_CROSS_SECTION import get_cross_section
+
+    with pytest.raises(AttributeError):
+        get_cross_section().I_zz = 0
+
+
+def test_panel_graph_any_stringer_count():
+    import numpy as np
+    from src.class_CONFIG import AileronConfig
+    from src.class_CROSS_SECTION import get_cross_section
+
+    for nst in [9, 13, 15, 21]:
+        cross_section = get_cross_section(AileronConfig.from_module().replace(nst=nst))
+        n_booms = len(cross_section.booms)
+
+        assert n_booms == nst + 2
+        assert len(cross_section.panels) == n_booms + 1
+
+        # --- Every boom is connected to two panels, the spar booms to three
+        connections = np.bincount(np.concatenate([cross_section.panel_start, cross_section.panel_end]))
+        assert list(np.flatnonzero(connections == 3)) == sorted([cross_section.spar_top, cross_section.spar_bottom])
+        assert np.count_nonzero(connections == 2) == n_booms - 2
+
+        # --- Closed section shear flows of a shear force in y direction carry the shear force only
+        y_pos = np.array(cross_section.booms_y_positions)
+        properties = cross_section.panel_properties
+        dz = np.array(cross_section.booms_z_positions)[cross_section.panel_end] - \
+            np.array(cross_section.booms_z_positions)[cross_section.panel_start]
+        assert properties.unit_sy @ cross_section.panel_delta_y == pytest.approx(
+            np.sum(cross_section.boom_areas*y_pos**2)/cross_section.I_u)
+        assert properties.unit_sy @ dz == pytest.approx(0., abs=1e-9)
+
+        assert 0 < cross_section.shear_center_u < cross_section.ha
+
+
+def test_shear_center_regression():
+    from src.class_CONFIG import AileronConfig
+    from src.class_CROSS_SECTION import get_cross_section
+
+    # --- config.py section (nst = 15), panel graph model. The original hard-coded 17 boom implementation gave
+    # --- 106.17292200359147 mm
+    assert AileronConfig.from_module().nst == 15
+    assert get_cross_section().shear_center_u == pytest.approx(105.26865392554846, rel=1e-12)
+
+    # --- Smooth over the stringer count, a single model for all of them
+    shear_centers = [get_cross_section(AileronConfig.from_module().replace(nst=nst)).shear_center_u
+                     for nst in [11, 13, 15, 17, 19]]
+    assert shear_centers == pytest.approx([107.10352767059382, 105.87148957052723, 105.26865392554846,
+                                           104.2816021710477, 104.06455571415177], rel=1e-12)
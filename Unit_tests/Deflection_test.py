@@ -0,0 +1,66 @@
+import pytest
+
+
+def test_hinge_deflection_boundary_conditions():
+    import numpy as np
+    import src.force_calculations_v2 as fc
+    from src.class_CONFIG import AileronConfig
+
+    cfg = AileronConfig.from_module()
+    x = np.array([cfg.x1, cfg.x2, cfg.x3])
+
+    assert fc.Y_deflection(x, cfg) == pytest.approx([cfg.d1, 0., cfg.d3], abs=1e-9)
+    assert fc.Z_deflection(x, cfg) == pytest.approx([0., 0., 0.], abs=1e-9)
+
+
+def test_edge_deflection():
+    import numpy as np
+    from src.class_CONFIG import AileronConfig
+    from src.deflection_calculations import deflection_calc
+
+    cfg = AileronConfig.from_module()
+    x_pos = np.linspace(0, cfg.la, 10**6)
+
+    # --- No twist: the edges follow the hinge line
+    deflection = deflection_calc(x_pos, np.full(len(x_pos), cfg.theta), cfg)
+    assert len(deflection.te_y) == 10**6
+    assert np.array_equal(deflection.le_y, deflection.hinge_y)
+    assert np.array_equal(deflection.te_z, deflection.hinge_z)
+
+    # --- Trailing edge down rotation
+    deflection = deflection_calc([0.], [cfg.theta + 1.], cfg)
+    te_arm = cfg.ca - cfg.ha/2
+    assert deflection.te_y[0] - deflection.hinge_y[0] == pytest.approx(
+        -te_arm*(np.sin(np.radians(cfg.theta + 1.)) - np.sin(np.radians(cfg.theta))))
+    assert deflection.le_y[0] - deflection.hinge_y[0] > 0
+
+
+def test_edge_deflection_iterative_solver():
+    import numpy as np
+    from src.analysis import reaction_forces
+    from src.class_CONFIG import AileronConfig
+    from src.deflection_calculations import deflection_calc
+
+    cfg = AileronConfig.from_module()
+    x_pos = np.linspace(0, cfg.la, 1000)
+    theta_deg = np.full(len(x_pos), cfg.theta + 0.5)
+
+    # --- The integrated deflection of the iterative solvers matches the closed form solution
+    direct = deflection_calc(x_pos, theta_deg, cfg)
+    solution = {}
+    reaction_forces(cfg, n_steps=10000, method="iterative", cache=False, solution=solution)
+    iterative = deflection_calc(x_pos, theta_deg, cfg, solution)
+    for name in direct._fields:
+        assert np.abs(getattr(iterative, name) - getattr(direct, name)).max() < 1e-3*np.abs(direct.le_y).max()
+    assert not np.array_equal(iterative.hinge_y, direct.hinge_y)
+
+
+def test_span_deflection_single_station():
+    from src.class_CONFIG import AileronConfig
+    from src.class_SPAN import SpanModel
+
+    cfg = AileronConfig.from_module()
+    deflection = SpanModel([cfg.x1], cfg=cfg).deflection()
+
+    assert len(deflection.le_y) == 1
+    assert len(SpanModel([], cfg=cfg).deflection().hinge_z) == 0
@@ -0,0 +1,52 @@
+import pytest
+
+
+def test_y_force_direct():
+    import src.force_calculations_v2 as fc
+    from config import q, la
+
+    iterative = fc.Y_force(n_steps=10000, plot=False, info=False, ret=True)
+    direct = fc.Y_force(plot=False, info=False, ret=True, method="direct")
+
+    assert len(direct) == 5
+    assert direct[1] == 0 and direct[3] == 0
+    assert direct == pytest.approx(iterative, rel=1e-3)
+
+    # --- Vertical equilibrium
+    assert direct[0] + direct[2] + direct[4] == pytest.approx(q*la)
+
+
+def test_z_force_direct():
+    import src.force_calculations_v2 as fc
+
+    FY = fc.Y_force(plot=False, info=False, ret=True, method="direct")
+    iterative = fc.Z_force(FY, n_steps=10000, plot=False, info=False, ret=True)
+    direct = fc.Z_force(FY, plot=False, info=False, ret=True, method="direct")
+
+    assert len(direct) == 5
+    assert direct[3] == fc.solver_constants().P
+    assert direct == pytest.approx(iterative, rel=1e-3)
+
+    # --- Compatibility: no deflection at the hinges
+    from config import x1, x2, x3, xa, p
+
+    F1, R, F2, F3, C1, C2 = fc.Z_force_direct()
+    for x in [x1, x2, x3]:
+        disp = (F1*fc.macaulay(x, x1, 3) + R*fc.macaulay(x, x2 - xa/2, 3) + F2*fc.macaulay(x, x2, 3)
+                + p*fc.macaulay(x, x2 + xa/2, 3) + F3*fc.macaulay(x, x3, 3))/6 + C1*x + C2
+        assert disp == pytest.approx(0, abs=1e-6*abs(C2))
+
+
+def test_solver_constants_follow_config(monkeypatch):
+    import config
+    import src.force_calculations_v2 as fc
+
+    reference = fc.solver_constants()
+    reference_forces = fc.Y_force(plot=False, info=False, ret=True, method="direct")
+
+    monkeypatch.setattr(config, "tsp", 2 * config.tsp)
+    assert fc.solver_constants().I1_zz != reference.I1_zz
+    assert fc.Y_force(plot=False, info=False, ret=True, method="direct") != reference_forces
+
+    monkeypatch.undo()
+    assert fc.solver_constants() is reference
@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+
+
+def test_integrate_beam():
+    from src.tools_integration import integrate_beam
+
+    x_pos = np.array([0, 1, 3, 4, 7, 8, 10], dtype=float)
+    w = 2.
+    EI = 5.
+
+    shear, moment, angle, disp = integrate_beam(x_pos, w, [-3, 4], [2, 5], EI=EI, moment_sign=-1, y0=1, a0=0.5)
+
+    # --- Reference: station by station recurrence
+    ref_shear, ref_moment, ref_angle, ref_disp = [0], [0], [0.5], [1]
+    for i in range(1, len(x_pos)):
+        dx = x_pos[i] - x_pos[i-1]
+        ref_shear.append(ref_shear[-1] + w*dx + {2: -3, 5: 4}.get(i, 0))
+        ref_moment.append(ref_moment[-1] - ref_shear[-1]*dx)
+        ref_angle.append(ref_angle[-1] + ref_moment[-1]*dx/EI)
+        ref_disp.append(ref_disp[-1] + ref_angle[-1]*dx)
+
+    assert shear == pytest.approx(ref_shear)
+    assert moment == pytest.approx(ref_moment)
+    assert angle == pytest.approx(ref_angle)
+    assert disp == pytest.approx(ref_disp)
+
+
+def test_adjust_deflection():
+    from src.tools_integration import adjust_deflection
+
+    x_pos = np.linspace(0, 10, 11)
+    disp, angle = adjust_deflection(x_pos, x_pos**2, 2*x_pos, 3, 8, 3, 8, d_a=1, d_b=-2)
+
+    assert disp[3] == pytest.approx(1)
+    assert disp[8] == pytest.approx(-2)
+    assert angle[5] == pytest.approx((disp[6] - disp[4])/2)
+
+
+def test_cumulative_integral_trapezoid():
+    from src.tools_integration import cumulative_integral
+
+    x_pos = np.array([0, 0.1, 0.5, 2, 2.2, 5], dtype=float)
+
+    # --- Exact for linear integrands on non-uniform stations
+    assert cumulative_integral(3*x_pos + 1, np.diff(x_pos), 2., rule="trapezoid") == \
+        pytest.approx(1.5*x_pos**2 + x_pos + 2)
+
+    with pytest.raises(ValueError):
+        cumulative_integral(x_pos, np.diff(x_pos), rule="simpson")
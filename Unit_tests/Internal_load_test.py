@@ -0,0 +1,24 @@
+import pytest
+import numpy as np
+
+
+def test_internal_load_calc():
+    from src.internal_load_calculations import internal_load_calc
+
+    x_pos = np.array([0, 50, 100, 150, 200, 250, 300], dtype=float)
+    feature_x = [100, 200]
+    feature_y_load = [10, -4]
+    feature_z_load = [3, 1]
+    q = 0.5
+
+    y_load, z_load, y_moment, z_moment = internal_load_calc(x_pos, feature_x, feature_y_load, feature_z_load, q)
+
+    # --- Reference: station by station recurrence
+    for i in range(1, len(x_pos)):
+        x = x_pos[i]
+        assert y_load[i] == pytest.approx(q*x - sum(f for xf, f in zip(feature_x, feature_y_load) if x >= xf))
+        assert z_load[i] == pytest.approx(-sum(f for xf, f in zip(feature_x, feature_z_load) if x >= xf))
+        assert y_moment[i] == pytest.approx(q*x**2/2 - sum(f*(x - xf) for xf, f in zip(feature_x, feature_y_load) if x > xf))
+        assert z_moment[i] == pytest.approx(-sum(f*(x - xf) for xf, f in zip(feature_x, feature_z_load) if x > xf))
+
+    assert y_load[0] == 0 and y_moment[0] == 0
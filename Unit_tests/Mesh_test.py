@@ -0,0 +1,35 @@
+import pytest
+import numpy as np
+
+
+def test_adaptive_mesh():
+    from src.tools_mesh import adaptive_mesh, feature_locations
+    from src.class_CONFIG import get_config
+
+    cfg = get_config(None)
+    x_pos = adaptive_mesh(cfg, h_min=1e-2, h_max=10.)
+    dx = np.diff(x_pos)
+
+    assert x_pos[0] == 0 and x_pos[-1] == pytest.approx(cfg.la)
+    assert np.all(dx > 0)
+    assert np.all(np.isin(feature_locations(cfg), x_pos))
+
+    # --- Fine next to the point loads, coarse between them
+    assert dx.min() == pytest.approx(1e-2, rel=0.5)
+    assert dx.max() <= 10.
+
+
+def test_tip_deflection_error():
+    from src.tools_mesh import adaptive_mesh, tip_deflection_error
+    from src.force_calculations_v2 import Y_deflection, Z_deflection
+    from src.class_CONFIG import get_config
+
+    cfg = get_config(None)
+    x_pos = adaptive_mesh(cfg)
+    tip = tip_deflection_error(x_pos, cfg)
+
+    # --- An order of magnitude fewer stations than the uniform grid, close to the closed form solution
+    assert tip.n_stations < 1000
+    assert tip.y == pytest.approx(Y_deflection(cfg.la, cfg), abs=10*tip.y_error + 1e-6)
+    assert tip.z == pytest.approx(Z_deflection(cfg.la, cfg), abs=10*tip.z_error + 1e-6)
+    assert tip.y_error < 1e-3
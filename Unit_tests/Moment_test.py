@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+
+
+def test_moment_calc():
+    from src.moment_calculations import moment_calc
+    from src.class_CROSS_SECTION import get_cross_section
+    from config import theta, ha, ca, q, G
+
+    FY = [700, 0, -1200, 0, 500]
+    FZ = [20, -110, 6, 97, -11]
+    x_separation = list(np.random.RandomState(0).uniform(1, 3, 30))
+    feature_lst = [3, 8, 12, 16, 25]
+
+    torque, theta_deg = moment_calc(FY, FZ, x_separation, feature_lst)
+
+    # --- Reference: station by station integration
+    cross_section = get_cross_section()
+    theta_max = np.radians(theta)
+    sc = cross_section.shear_center_u
+    arm_a = ha/2*np.sqrt(2)*np.sin(np.pi/4-theta_max) - (sc - ha/2)*np.sin(theta_max)
+    arm_q = (ca/4 - sc)*np.cos(theta_max)
+    arm_y = (sc - ha/2)*np.cos(theta_max)
+    arm_z = (sc - ha/2)*np.sin(theta_max)
+    J = cross_section.I_zz + cross_section.I_yy
+
+    ref_torque = [0]*(len(x_separation)+1)
+    ref_theta = [0]*(len(x_separation)+1)
+    for i in range(1, len(x_separation)+1):
+        dx = x_separation[i-1]
+        ref_torque[i] = ref_torque[i-1] + q*arm_q*dx
+        if i in feature_lst:
+            k = feature_lst.index(i)
+            if k in (1, 3):
+                ref_torque[i] += FZ[k]*arm_a
+            else:
+                ref_torque[i] += FY[k]*arm_y - FZ[k]*arm_z
+        ref_theta[i] = ref_theta[i-1] - ref_torque[i]*dx/(G*J)
+
+    adjustment = ref_theta[feature_lst[1]] + theta_max
+    ref_theta_deg = [-(t - adjustment)*180/np.pi for t in ref_theta]
+
+    assert isinstance(torque, np.ndarray)
+    assert torque == pytest.approx(ref_torque)
+    assert theta_deg == pytest.approx(ref_theta_deg)
+    assert theta_deg[feature_lst[1]] == pytest.approx(theta)
+    assert torque[0] == 0 and theta_deg[0] == pytest.approx(np.degrees(adjustment))
@@ -0,0 +1,24 @@
+import os
+
+
+def test_export_span_plots(tmp_path):
+    from src.analysis import run_analysis
+    from src.tools_plot import export_span_plots, SPAN_PLOTS
+    from src.class_CONFIG import get_config
+
+    cfg = get_config(None)
+    results = run_analysis(cfg, nb_of_slices=100, cache=False)
+
+    paths = export_span_plots(results, str(tmp_path / "plots"), dpi=50, cfg=cfg)
+
+    assert len(paths) == len(SPAN_PLOTS)
+    assert all(os.path.getsize(path) > 0 for path in paths)
+
+
+def test_solver_plot_export(tmp_path):
+    import src.force_calculations_v2 as fc
+
+    path = str(tmp_path / "shear.png")
+    fc.Y_force(n_steps=200, plot=path, info=False, method="direct")
+
+    assert os.path.getsize(path) > 0
@@ -0,0 +1,29 @@
+import json
+
+
+def test_profiling_report():
+    import src.tools_profiling as profiling
+    import src.force_calculations_v2 as fc
+
+    profiling.reset()
+    profiling.enable()
+    try:
+        fc.Y_force(n_steps=200, plot=False, info=False, ret=True, method="iterative")
+        with profiling.timer("outer"):
+            profiling.count("custom", 3)
+        report = profiling.report()
+    finally:
+        profiling.disable()
+
+    assert report["timers"]["Y_force"]["calls"] == 1
+    assert report["timers"]["Y_force.integration"]["calls"] == report["counters"]["Y_force.iterations"] > 0
+    assert report["timers"]["outer"]["total"] >= 0
+    assert report["counters"]["custom"] == 3
+    assert json.loads(profiling.report_json())["counters"]["custom"] == 3
+    assert "Y_force.iterations" in profiling.report_text()
+
+    # --- Disabled: nothing recorded
+    profiling.reset()
+    fc.Y_force(n_steps=200, plot=False, info=False, ret=True, method="iterative")
+    profiling.count("custom")
+    assert profiling.report() == {"timers": {}, "counters": {}}
@@ -0,0 +1,48 @@
+import pytest
+import numpy as np
+
+
+def test_result_store(tmp_path):
+    from src.analysis import run_analysis
+    from src.class_CONFIG import get_config
+    from src.tools_results import create_store, append_results, open_store, read_field, SPAN_FIELDS
+    from src.tools_cache import cache_key
+
+    path = str(tmp_path / "results.svv")
+    configs = [get_config(None).replace(q=q) for q in (5.54, 6.5)]
+    results = [run_analysis(cfg, nb_of_slices=100, cache=False) for cfg in configs]
+
+    create_store(path, results[0]["x_location"])
+    assert len(open_store(path).data) == 0
+
+    for cfg, result in zip(configs, results):
+        append_results(path, result, cfg)
+
+    store = open_store(path)
+    assert isinstance(store.data, np.memmap)
+    assert store.data.shape == (2, len(SPAN_FIELDS), 105)
+    assert store.fields == SPAN_FIELDS
+    assert np.array_equal(store.x_location, results[0]["x_location"])
+    assert store.config_hash[1].decode() == cache_key(configs[1])
+
+    assert np.array_equal(read_field(path, "x_torque", 1), results[1]["x_torque"])
+    assert np.array_equal(read_field(path, "deflection_te_y")[0], results[0]["deflection_te_y"])
+
+    with pytest.raises(KeyError):
+        read_field(path, "unknown")
+
+    # --- Designs on other stations are rejected
+    with pytest.raises(ValueError):
+        append_results(path, run_analysis(configs[0], nb_of_slices=50, cache=False), configs[0])
+
+
+def test_sweep_store(tmp_path):
+    from src.parameter_sweep import run_sweep
+    from src.tools_results import read_field
+
+    path = str(tmp_path / "sweep.svv")
+    table = run_sweep([{"q": 5.54}, {"q": 6.5}], max_workers=1, nb_of_slices=100, cache=False, store=path)
+
+    moments = read_field(path, "z_internal_moment")
+    assert moments.shape == (2, 105)
+    assert np.max(np.abs(moments), axis=1) == pytest.approx(table["max_z_internal_moment"])
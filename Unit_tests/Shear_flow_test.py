@@ -0,0 +1,183 @@
+import pytest
+
+
+def _scalar_rib_shear_flow(cs, Sy, Sz, My, Mz, Tx):
+    # --- Reference: one load case, panel by panel, with the closure system solved directly
+    from math import tan
+    import numpy as np
+
+    y, z = cs.booms_y_positions, cs.booms_z_positions
+    booms = range(len(cs.booms))
+
+    sigma = [Mz/cs.I_u*y[i] + My/cs.I_v*(z[i] - cs.u_centroid) for i in booms]
+    area = []
+    for i in booms:
+        area_i = cs.boom_stringer_area[i]
+        for panel in cs.panels:
+            if i in (panel.start_boom, panel.end_boom):
+                other = panel.end_boom if i == panel.start_boom else panel.start_boom
+                area_i += panel.thickness*panel.length/6*(2 + sigma[other]/sigma[i])
+        area.append(area_i)
+    dq = [-area[i]*(Sy/cs.I_u*y[i] + Sz/cs.I_v*(z[i] - cs.u_centroid)) for i in booms]
+
+    # --- Open section shear flows, cells cut at their first panel
+    q_open, last = [], {}
+    for panel in cs.panels:
+        if panel.cell == "Spar":
+            q_open.append(dq[cs.spar_bottom])
+        else:
+            q_open.append(last[panel.cell] + dq[panel.start_boom] if panel.cell in last else 0.)
+            last[panel.cell] = q_open[-1]
+
+    b = cs.spar_bottom
+    arm = [(z[p.start_boom] - z[b])*(y[p.end_boom] - y[p.start_boom])
+           - (y[p.start_boom] - y[b])*(z[p.end_boom] - z[p.start_boom]) for p in cs.panels]
+    flexibility = {cell: sum(p.length/p.thickness for p in cs.panels if p.cell == cell)
+                   for cell in ("Curved", "Triangular", "Spar")}
+    twist = [{"Curved": 1., "Triangular": 1., "Spar": -2.}[p.cell]*p.length/p.thickness for p in cs.panels]
+
+    # --- Moment equilibrium around the bottom spar boom and equal rates of twist of the cells
+    A1 = np.pi*cs.ha**2/8
+    A2 = 0.5*cs.ha*(cs.ca - 0.5*cs.ha)
+    M = -Sz*0.5*cs.ha + Sy*(cs.shear_center_u - z[b]) - Tx
+    q_s01, q_s02 = np.linalg.solve(
+        [[-2*A1, -2*A2],
+         [flexibility["Curved"] + 2*flexibility["Spar"], -flexibility["Triangular"] - 2*flexibility["Spar"]]],
+        [M - sum(q*a for q, a in zip(q_open, arm)), -sum(q*t for q, t in zip(q_open, twist))])
+
+    delta_y = [y[p.end_boom] - y[p.start_boom] for p in cs.panels]
+    q1 = sum((q + q_s01)*dy for q, dy, p in zip(q_open, delta_y, cs.panels) if p.cell == "Curved")/cs.ha
+
+    triangular = [k for k, p in enumerate(cs.panels) if p.cell == "Triangular"]
+    P13z = (2*q_s02*A2 + sum(q_open[k]*arm[k] for k in triangular))/cs.ha
+    q2 = (-q_s02*cs.ha + sum(q_open[k]*delta_y[k] for k in triangular) - P13z*tan(cs.angle_tail))/cs.ha
+
+    return q1, q2
+
+
+def test_batch_shear_flow_matches_ribs():
+    import numpy as np
+    from src.class_CONFIG import AileronConfig
+    from src.class_CROSS_SECTION import get_cross_section
+    from src.class_SLICE import Rib
+    from src.shear_flow_calculations import section_loads, shear_flow_calc
+
+    # --- Internal loads (Fy, Fz, My, Mz, Tx)
+    loads = np.array([[1000., 500., 2e5, -4e5, 3e4],
+                      [-2500., 1200., -1e6, 7e5, -1e5],
+                      [300., -800., 3e5, 1e5, 5e4],
+                      [-40., -3000., -5e5, -8e5, 2e5],
+                      [12000., -6000., 1.5e6, 2e6, -4e5]]).T
+
+    for nst in [11, 15, 21]:
+        cross_section = get_cross_section(AileronConfig.from_module().replace(nst=nst))
+
+        Sy, Sz, My, Mz = section_loads(*loads[:4], 28)
+        q1, q2, q_s01, q_s02 = shear_flow_calc(cross_section, Sy, Sz, My, Mz, loads[4])
+        reference = [_scalar_rib_shear_flow(cross_section, *case) for case in zip(Sy, Sz, My, Mz, loads[4])]
+
+        assert q1.shape == q_s02.shape == (5,)
+        assert q1 == pytest.approx([q for q, _ in reference], rel=1e-9)
+        assert q2 == pytest.approx([q for _, q in reference], rel=1e-9)
+
+    # --- Scalar loads give scalar shear flows, as used by Rib.calc_shear_flow
+    rib = Rib("A", 0)
+    rib.y_internal_load, rib.z_internal_load, rib.y_internal_moment, rib.z_internal_moment, rib.x_torque = loads[:, -1]
+    rib.calc_shear_flow()
+
+    Sy, Sz, My, Mz = section_loads(*loads[:4, -1], 28)
+    assert np.ndim(rib.q_s01) == 0
+    assert (rib.q1, rib.q2) == pytest.approx(_scalar_rib_shear_flow(rib.cross_section, Sy, Sz, My, Mz, loads[4, -1]),
+                                             rel=1e-9)
+
+
+def test_shear_flow_field():
+    import numpy as np
+    from src.analysis import run_analysis
+    from src.shear_flow_calculations import shear_flow_field, panel_properties
+
+    results = run_analysis(nb_of_slices=200, cache=False, fields=True)
+    field = results["panel_shear_flow"]
+
+    from src.class_CROSS_SECTION import get_cross_section
+    cross_section = get_cross_section()
+
+    assert field.shape == (len(results["x_location"]), len(cross_section.panels))
+    assert results["max_panel_shear_flow"] == pytest.approx(np.abs(field).max(), rel=1e-12)
+    assert results["max_direct_stress"] == pytest.approx(results["direct_stress"].max(), rel=1e-12)
+    assert results["min_direct_stress"] == pytest.approx(results["direct_stress"].min(), rel=1e-12)
+
+    # --- Only the streamed peaks by default
+    assert "panel_shear_flow" not in run_analysis(nb_of_slices=200, cache=False)
+
+    # --- Linear in the loads
+    unit = shear_flow_field(cross_section, [1., 0., 0.], [0., 1., 0.], [0., 0., 1.])
+    loads = np.array([[2., -3., 5.]])
+    assert shear_flow_field(cross_section, *loads.T) == pytest.approx(loads @ unit, rel=1e-12, abs=1e-12)
+
+    # --- Closure shear flows satisfy the rate of twist compatibility
+    assert np.abs(field @ panel_properties(cross_section).twist).max() < 1e-9*np.abs(field).max()
+
+
+def test_unit_load_solutions():
+    import numpy as np
+    from src.class_CROSS_SECTION import get_cross_section
+
+    cross_section = get_cross_section()
+    properties = cross_section.panel_properties
+
+    assert properties.A_inv @ properties.A == pytest.approx(np.eye(2), abs=1e-12)
+    assert get_cross_section().panel_properties is properties
+    assert not properties.unit_sy.flags.writeable
+
+    # --- Unit torque: constant shear flow in each cell, compatible rates of twist
+    q_s01, q_s02 = properties.closure_moment*(-1.)
+    assert properties.unit_tx[cross_section.panel_cell == "Curved"] == pytest.approx(q_s01, rel=1e-12)
+    assert properties.unit_tx[cross_section.panel_cell == "Triangular"] == pytest.approx(-q_s02, rel=1e-12)
+    assert properties.unit_tx @ properties.twist == pytest.approx(0., abs=1e-12)
+
+
+def test_rib_shear_flow_regression():
+    from src.analysis import run_analysis
+
+    # --- Ribs A to D of config.py (nst = 15), panel graph model. The original hard-coded 17 boom implementation
+    # --- gave q1 = -1473.0, -1394.6, 1013.1, -23.6 and q2 = 2524.9, 2607.2, -1861.3, 16.2 with the torque of the
+    # --- previous station (without the point torque of the rib itself)
+    results = run_analysis(cache=False)
+
+    assert list(results["rib_labels"]) == ["A", "B", "C", "D"]
+    assert results["rib_q1"] == pytest.approx([-1458.8159967207914, -1469.9548646210176, 1075.8173864184819,
+                                               -1.0112359670308921], rel=1e-9)
+    assert results["rib_q2"] == pytest.approx([2526.9638929232406, 2668.2140650980446, -1910.5009087945184,
+                                               1.5360132963516695], rel=1e-9)
+
+
+def test_panel_properties_cleared_with_cross_section():
+    from src.class_CROSS_SECTION import get_cross_section, clear_cross_section_cache
+    from src.shear_flow_calculations import panel_properties
+
+    cross_section = get_cross_section()
+    assert panel_properties(cross_section) is cross_section.panel_properties
+
+    clear_cross_section_cache()
+    rebuilt = get_cross_section()
+    assert rebuilt is not cross_section
+    assert panel_properties(rebuilt) is rebuilt.panel_properties is not cross_section.panel_properties
+
+
+def test_shear_flow_field_at_ribs():
+    import numpy as np
+    from src.analysis import run_analysis
+    from src.class_CROSS_SECTION import get_cross_section
+
+    results = run_analysis(cache=False, fields=True)
+    cross_section = get_cross_section()
+
+    # --- Load independent boom areas of the field against the stress dependent ones of the rib shear flows
+    rib_index = results["feature_index"][[0, 1, 3, 4]]    # ribs A, B, C, D (feature 2 is the hinged slice)
+    field = results["panel_shear_flow"][rib_index]
+
+    curved = cross_section.panel_cell == "Curved"
+    q1 = field[:, curved] @ cross_section.panel_delta_y[curved]/cross_section.ha
+
+    assert np.abs(q1 - results["rib_q1"]).max() < 1e-2*np.abs(results["rib_q1"]).max()
@@ -0,0 +1,39 @@
+import pytest
+
+
+def test_span_from_slices():
+    from src.class_SLICE import Simple_slice, Hinged_slice, Rib
+    from src.class_SPAN import SpanModel
+
+    model = [Simple_slice(1, 0), Rib("A", 50, deflection=2, y_load=10), Simple_slice(2, 100),
+             Hinged_slice(1, 120, z_load=-5), Simple_slice(3, 200)]
+    model[1].x_torque = 3
+
+    span = SpanModel.from_slices(model)
+
+    assert len(span) == 5
+    assert list(span.feature_index) == [1, 3]
+    assert list(span.feature_x_location) == [50, 120]
+    assert list(span.point_loads("y")) == [0, 10, 0, 0, 0]
+    assert list(span.point_loads("z")) == [0, 0, 0, -5, 0]
+
+    rib = span.feature_slice(0)
+    assert type(rib) is Rib
+    assert rib.label == "A"
+    assert rib.deflection == 2
+    assert rib.x_torque == 3
+
+    assert type(span.feature_slice(1)) is Hinged_slice
+
+
+def test_span_from_features():
+    from src.class_SLICE import Hinged_slice, Rib
+    from src.class_SPAN import SpanModel
+
+    features = [Rib("D", 90), Rib("A", 12.5, deflection=1), Hinged_slice(1, 50)]
+    span = SpanModel.from_features(features, 100, 5)
+
+    assert list(span.x_location) == [0, 12.5, 25, 50, 50, 75, 90, 100]
+    assert list(span.feature_index) == [1, 3, 6]
+    assert span.feature_labels == ("A", 1, "D")
+    assert list(span.feature_deflection) == [1, 0, 0]
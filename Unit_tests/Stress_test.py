@@ -0,0 +1,63 @@
+import pytest
+
+
+def test_direct_stress_field():
+    import numpy as np
+    from src.class_CROSS_SECTION import get_cross_section
+    from src.stress_calculations import direct_stress_field
+
+    cross_section = get_cross_section()
+    field = direct_stress_field(cross_section, [0., 2e6, 1e6], [1e6, 0., -3e6])
+
+    assert field.shape == (3, len(cross_section.booms_y_positions))
+
+    i = 7
+    y, z = cross_section.booms_y_positions[i], cross_section.booms_z_positions[i]
+    assert field[2, i] == pytest.approx(-3e6/cross_section.I_u*y + 1e6/cross_section.I_v*(z - cross_section.u_centroid))
+
+    # --- Pure Mz: no stress on the symmetry axis, antisymmetric top/bottom booms
+    assert field[0, 16] == pytest.approx(0.)
+    assert field[0, 0] == pytest.approx(-field[0, 1])
+
+
+def test_stress_peaks():
+    import numpy as np
+    from src.stress_calculations import stress_peaks
+
+    field = np.array([[1., -4., 2.], [6., 0., -1.]])
+    maximum, minimum = stress_peaks(field, np.array([10., 20.]))
+
+    assert (maximum.value, maximum.station, maximum.x_location, maximum.boom) == (6., 1, 20., 0)
+    assert (minimum.value, minimum.station, minimum.x_location, minimum.boom) == (-4., 0, 10., 1)
+
+
+def test_von_mises_blocks():
+    import numpy as np
+    from src.class_CROSS_SECTION import get_cross_section
+    from src.von_mises_calculations import von_mises_blocks, von_mises_peak
+
+    cross_section = get_cross_section()
+    rng = np.random.default_rng(0)
+    Sy, Sz, Tx = rng.normal(size=(3, 1000))*1e4
+    My, Mz = rng.normal(size=(2, 1000))*1e6
+    x_pos = np.linspace(0, 2661, 1000)
+
+    blocks = list(von_mises_blocks(cross_section, Sy, Sz, My, Mz, Tx, x_pos, block_size=300))
+    assert [(block.start, block.stop) for block in blocks] == [(0, 300), (300, 600), (600, 900), (900, 1000)]
+
+    field = np.vstack([block.von_mises for block in blocks])
+    assert field.shape == (1000, 17 + 18)
+    assert np.all(field >= 0)
+
+    # --- Running maximum, independent of the block size
+    assert blocks[1].peak.value == field[:600].max()
+    peak = von_mises_peak(cross_section, Sy, Sz, My, Mz, Tx, x_pos, block_size=1000)
+    assert peak == blocks[-1].peak
+    assert peak.value == field.max() and peak.x_location == x_pos[peak.station]
+
+    # --- Running extremes of the panel shear flows and boom direct stresses
+    from src.shear_flow_calculations import shear_flow_field
+    from src.stress_calculations import direct_stress_field
+    sigma = direct_stress_field(cross_section, My, Mz)
+    assert blocks[-1].max_shear_flow == np.abs(shear_flow_field(cross_section, Sy, Sz, Tx)).max()
+    assert (blocks[-1].max_direct_stress, blocks[-1].min_direct_stress) == (sigma.max(), sigma.min())
@@ -0,0 +1,38 @@
+import pytest
+
+
+def test_parameter_grid():
+    from src.parameter_sweep import parameter_grid
+
+    grid = parameter_grid(tsk=[1.1, 1.2], q=[5, 6, 7])
+
+    assert len(grid) == 6
+    assert grid[0] == {"tsk": 1.1, "q": 5}
+    assert grid[-1] == {"tsk": 1.2, "q": 7}
+
+
+def test_run_sweep():
+    import config
+    from src.parameter_sweep import run_sweep, run_design_point
+
+    parameter_sets = [{"tsp": 2.8, "q": 5.54}, {"tsp": 3.2, "q": 5.54}, {"tsp": 2.8, "q": 6.5}]
+
+    serial = run_sweep(parameter_sets, max_workers=1, nb_of_slices=200, cache=False)
+    pooled = run_sweep(parameter_sets, max_workers=2, nb_of_slices=200, cache=False)
+
+    assert len(serial) == 3
+    assert list(serial["tsp"]) == [2.8, 3.2, 2.8]
+    assert list(serial["F1y"]) == list(pooled["F1y"])
+    assert serial["F1y"][0] != serial["F1y"][1]
+    assert serial["max_y_internal_moment"][2] != serial["max_y_internal_moment"][0]
+
+    # --- config.py values left untouched
+    assert config.tsp == 2.8 and config.q == 5.54
+    assert serial["q1_A"][0] == run_design_point(None, nb_of_slices=200, cache=False)["q1_A"]
+
+
+def test_run_sweep_unknown_variable():
+    from src.parameter_sweep import run_sweep
+
+    with pytest.raises(ValueError):
+        run_sweep([{"not_a_variable": 1}], max_workers=1)
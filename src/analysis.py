@@ -0,0 +1,149 @@
+import numpy as np
+
+import src.force_calculations_v2 as fc
+from src.class_SLICE import Rib, Hinged_slice
+from src.shear_flow_calculations import section_loads, shear_flow_calc
+from src.class_SPAN import SpanModel
+from src.internal_load_calculations import internal_load_calc
+from src.moment_calculations import moment_calc
+from src.class_CONFIG import get_config
+from src.tools_cache import cache_key, cache_load, cache_store
+from src.tools_profiling import profiled, timer, count
+
+
+@profiled
+def reaction_forces(cfg=None, n_steps=10000, method="direct", cache=True, solution=None):
+    """
+    Solve the reaction forces of a configuration, or load them from the on-disk result cache
+    when the same solver inputs (see force_calculations_v2.SOLVER_PARAMETERS), n_steps, method and solver version
+    were solved before. Configurations differing only by other values (e.g. nb_of_slices) share the entry, and so do
+    all n_steps of the direct method, which does not integrate over stations.
+
+    :param cache: Use the result cache (see src.tools_cache)
+    :param solution: Optional dictionary filled with the hinge line deflection of the iterative solvers on their own
+                     stations (y_x_pos, y_disp, z_x_pos and z_disp arrays, see deflection_calc), left empty for the
+                     direct method
+    :return: FY, FZ lists (see Y_force and Z_force)
+    """
+    cfg = get_config(cfg)
+    key = cache_key("reaction_forces", fc.solver_key(cfg), n_steps if method != "direct" else None, method,
+                    fc.SOLVER_VERSION)
+    deflection_names = ["y_x_pos", "y_disp", "z_x_pos", "z_disp"] if method != "direct" else []
+
+    if cache:
+        entry = cache_load(key)
+        if entry is not None and all(name in entry for name in deflection_names):
+            count("reaction_forces.cache_hits")
+            if solution is not None:
+                solution.update({name: entry[name] for name in deflection_names})
+            return entry["FY"].tolist(), entry["FZ"].tolist()
+        count("reaction_forces.cache_misses")
+
+    y_solution, z_solution = {}, {}
+    FY = fc.Y_force(n_steps=n_steps, plot=False, info=False, ret=True, method=method, cfg=cfg, solution=y_solution)
+    FZ = fc.Z_force(FY, n_steps=n_steps, plot=False, info=False, ret=True, method=method, cfg=cfg,
+                    solution=z_solution)
+
+    deflection = {}
+    if deflection_names:
+        deflection = {"y_x_pos": y_solution["x_pos"], "y_disp": y_solution["disp"],
+                      "z_x_pos": z_solution["x_pos"], "z_disp": z_solution["disp"]}
+    if solution is not None:
+        solution.update(deflection)
+
+    if cache:
+        cache_store(key, {"FY": np.array(FY, dtype=float), "FZ": np.array(FZ, dtype=float), **deflection})
+
+    return FY, FZ
+
+
+@profiled
+def run_analysis(cfg=None, nb_of_slices=None, n_steps=10000, method="direct", cache=True, grid=None, fields=False):
+    """
+    Run the full analysis of a configuration: reaction forces, internal loads, torque/twist
+    and rib shear flows.
+
+    :param cfg: AileronConfig (current values in config.py by default)
+    :param nb_of_slices: Number of simple slices of the span discretisation (configuration value by default)
+    :param n_steps: Number of integration steps of the iterative force solvers
+    :param method: Force solver method ("direct" or "iterative")
+    :param cache: Use the on-disk result cache for the reaction forces
+    :param grid: Sorted simple slice x locations replacing the uniform grid of nb_of_slices slices
+                 (e.g. tools_mesh.adaptive_mesh(cfg))
+    :param fields: Also return the full panel shear flow and boom direct stress fields (stations x panels and
+                   stations x booms), otherwise only their peaks streamed with the Von Mises stress are returned
+    :return: Dictionary of NumPy arrays (span distributions, edge deflections, peak Von Mises stress, peak panel
+             shear flow and boom direct stresses, reaction forces and rib shear flows, and the panel_shear_flow and
+             direct_stress fields if requested)
+    """
+    cfg = get_config(cfg)
+
+    if nb_of_slices is None:
+        nb_of_slices = cfg.nb_of_slices
+
+    # --- Reaction forces
+    solution = {}
+    fy, fz = reaction_forces(cfg, n_steps=n_steps, method=method, cache=cache, solution=solution)
+    fx = [0, 0, 0, 0, 0]
+
+    # --- Span discretisation
+    features = [Rib("A", cfg.x1, deflection=cfg.d1, x_load=fx[0], y_load=fy[0], z_load=fz[0], cfg=cfg),
+                Rib("B", cfg.x2-(cfg.xa/2), x_load=fx[1], y_load=fy[1], z_load=fz[1], cfg=cfg),
+                Hinged_slice(1, cfg.x2, x_load=fx[2], y_load=fy[2], z_load=fz[2], cfg=cfg),
+                Rib("C", cfg.x2+(cfg.xa/2), x_load=fx[3], y_load=fy[3], z_load=fz[3], cfg=cfg),
+                Rib("D", cfg.x3, deflection=cfg.d3, x_load=fx[4], y_load=fy[4], z_load=fz[4], cfg=cfg)]
+
+    span = SpanModel.from_features(features, cfg.la, nb_of_slices, cfg=cfg, grid=grid)
+
+    # --- Internal loads
+    span.y_internal_load, span.z_internal_load, span.y_internal_moment, span.z_internal_moment = \
+        internal_load_calc(span.x_location, span.feature_x_location, span.feature_y_load, span.feature_z_load,
+                           cfg.q)
+
+    # --- Torque and twist
+    torque, theta_deg = moment_calc(fy, fz, span.x_separation, span.feature_index, cfg)
+    span.x_torque[:] = torque
+    span.displacement_theta[:] = theta_deg
+
+    # --- Von Mises stress, streamed by blocks of stations
+    max_von_mises = max_shear_flow = max_direct_stress = min_direct_stress = 0.
+    with timer("run_analysis.von_mises"):
+        for block in span.von_mises_blocks():
+            max_von_mises = block.peak.value
+            max_shear_flow, max_direct_stress, min_direct_stress = \
+                block.max_shear_flow, block.max_direct_stress, block.min_direct_stress
+
+    # --- Rib shear flows, all ribs in one batch
+    rib_k = [k for k in range(len(span.feature_index)) if span.feature_types[k] is Rib]
+    rib_index = span.feature_index[rib_k]
+
+    Sy, Sz, My, Mz = section_loads(span.y_internal_load[rib_index], span.z_internal_load[rib_index],
+                                   span.y_internal_moment[rib_index], span.z_internal_moment[rib_index], cfg.theta)
+    rib_q1, rib_q2, _, _ = shear_flow_calc(span.cross_section, Sy, Sz, My, Mz, span.x_torque[rib_index])
+
+    deflection = span.deflection(solution)
+
+    results = {"x_location": span.x_location,
+               "y_internal_load": span.y_internal_load,
+               "z_internal_load": span.z_internal_load,
+               "y_internal_moment": span.y_internal_moment,
+               "z_internal_moment": span.z_internal_moment,
+               "x_torque": span.x_torque,
+               "displacement_theta": span.displacement_theta,
+               "max_von_mises": max_von_mises,
+               "max_panel_shear_flow": max_shear_flow,
+               "max_direct_stress": max_direct_stress,
+               "min_direct_stress": min_direct_stress,
+               **{"deflection_" + name: value for name, value in deflection._asdict().items()},
+               "feature_index": span.feature_index,
+               "FY": np.array(fy, dtype=float),
+               "FZ": np.array(fz, dtype=float),
+               "rib_labels": np.array([span.feature_labels[k] for k in rib_k]),
+               "rib_q1": rib_q1,
+               "rib_q2": rib_q2}
+
+    if fields:
+        results["panel_shear_flow"] = span.shear_flow_field()
+        results["direct_stress"] = span.direct_stress_field()
+
+    return results
@@ -0,0 +1,98 @@
+import importlib.util
+from dataclasses import dataclass, fields, replace
+
+import config
+
+# CONSTANTS #
+MIN_STRINGERS = 3       # One stringer pair on the trailing edge skin, plus the leading edge stringer
+
+
+@dataclass(frozen=True, slots=True)
+class AileronConfig:
+    """
+    Immutable set of aileron geometry, load and material parameters (see config.py for units).
+
+    Instances are hashable, so they can be passed explicitly to the solvers and used as cache keys.
+    """
+    nb_of_slices: int
+
+    ca: float
+    la: float
+
+    x1: float
+    x2: float
+    x3: float
+    xa: float
+
+    ha: float
+    tsk: float
+    tsp: float
+    tst: float
+    hst: float
+    wst: float
+    nst: int
+    d1: float
+    d3: float
+    theta: float
+    p: float
+    q: float
+
+    E: float
+    G: float
+
+    def __post_init__(self):
+        check_stringer_count(self.nst)
+
+    @classmethod
+    def from_module(cls, module=config):
+        """
+        Load the configuration from a config module (config.py by default), reading its current values.
+        """
+        return cls(**{field.name: getattr(module, field.name) for field in fields(cls)})
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load the configuration from a Python file defining the same variables as config.py.
+        """
+        spec = importlib.util.spec_from_file_location("aileron_config", path)
+        if spec is None:
+            raise OSError("Cannot load a configuration from " + str(path))
+
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return cls.from_module(module)
+
+    @classmethod
+    def parameter_names(cls):
+        return tuple(field.name for field in fields(cls))
+
+    def replace(self, **changes):
+        """
+        Return a copy of the configuration with some parameters changed.
+        """
+        for name in changes:
+            if name not in self.parameter_names():
+                raise ValueError("Unknown design variable: " + str(name))
+        return replace(self, **changes)
+
+
+def check_stringer_count(nst):
+    """
+    Check that the number of stringers can be placed symmetrically on the cross-section.
+
+    :param nst: Number of stringers
+    :return: None, raises ValueError for an even number or less than MIN_STRINGERS stringers
+    """
+    if nst != int(nst) or nst < MIN_STRINGERS or nst % 2 == 0:
+        raise ValueError("The number of stringers must be odd and at least " + str(MIN_STRINGERS) +
+                         ", got nst = " + str(nst))
+
+
+def get_config(cfg=None):
+    """
+    Return cfg, or the configuration currently defined in config.py when cfg is None.
+    """
+    if cfg is None:
+        return AileronConfig.from_module()
+    return cfg
@@ -0,0 +1,515 @@
+from src.class_BOOM import Boom
+from src.class_PANEL import Panel
+from src.class_CONFIG import get_config, check_stringer_count
+from src.tools_profiling import timer
+from math import *
+import numpy as np
+
+GEOMETRY_PARAMETERS = ("ca", "ha", "tsk", "tsp", "tst", "hst", "wst", "nst", "theta")
+
+_cross_section_cache = {}
+
+
+class Cross_section:
+    """
+    Geometrical properties of the aileron cross-section (booms, centroid, moments of inertia, shear center).
+
+    The properties only depend on the geometry parameters, so a single instance is shared by all slices of a
+    model. Use get_cross_section() rather than instantiating directly. Instances are immutable once built.
+    """
+    def __init__(self, ca, ha, tsk, tsp, tst, hst, wst, nst, theta):
+        self.ca = ca
+        self.ha = ha
+        self.tsk = tsk
+        self.tsp = tsp
+        self.tst = tst
+        self.hst = hst
+        self.wst = wst
+        self.nst = nst
+        self.theta = theta
+
+        check_stringer_count(nst)
+
+        # --- Setup boom structure
+        self.construct_boom_structure()
+        # --- Setup panel connectivity graph
+        self.construct_panels()
+        # --- Calculate centroid
+        self.calc_centroid()
+        # --- Calculate moment of inertia
+        self.calc_mom_inertia()
+        # --- Calculate idealised boom areas
+        self.calc_boom_areas()
+        # --- Calculate shear center
+        self.calc_shear_center()
+        # --- Calculate closure inverse and unit load shear flow solutions
+        self.calc_panel_properties()
+
+        # --- Freeze boom position lists
+        self.booms_z_positions = tuple(self.booms_z_positions)
+        self.booms_y_positions = tuple(self.booms_y_positions)
+        self.z_positions_stringers = tuple(self.z_positions_stringers)
+        self.y_positions_stringers = tuple(self.y_positions_stringers)
+        for value in list(vars(self).values()) + list(self.panel_properties):
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Cross_section is immutable, use get_cross_section() with new parameters instead")
+        object.__setattr__(self, name, value)
+
+    def construct_boom_structure(self):
+        #  ______________________________ Creating boom structure
+        booms = []
+
+        r = self.ha/2
+        self.stiffener_pitch = (pi*r + 2*sqrt(r**2+(self.ca-r)**2))/self.nst
+        self.angle_tail = atan(r/(self.ca-r))
+
+        stiffener_count = 0
+
+        # --- Adding slanted edge booms
+        boom_z = self.ca-self.stiffener_pitch/2
+        while boom_z > r:
+            stiffener_count += 2
+            boom_y = (self.ca - boom_z) * tan(self.angle_tail)
+            booms.append(Boom(boom_y, boom_z, "Stringer", stiffener_count-1))
+            booms.append(Boom(-boom_y, boom_z, "Stringer", stiffener_count))
+            boom_z -= self.stiffener_pitch
+
+        if stiffener_count == 0 or stiffener_count + 2 > self.nst + 1:
+            raise ValueError("Cannot place " + str(self.nst) + " stringers on the cross-section, the trailing edge "
+                             "skin needs at least one stringer pair and the leading edge one stringer")
+
+        # --- Adding sheet booms
+        stiffener_count += 2
+        booms.append(Boom(r, r, "Spar", stiffener_count-1))
+        booms.append(Boom(-r, r, "Spar", stiffener_count))
+
+        # --- Adding circular section booms
+        circ_booms = []
+        boom_z = 0
+        front_stiffeners = self.nst + 3
+
+        while stiffener_count < self.nst+1:
+            stiffener_count += 2
+            front_stiffeners -= 2
+            boom_z += self.stiffener_pitch
+
+            circ_booms.append(Boom(-(r * sin(boom_z / r)), r - (r * cos(boom_z / r)), "Stringer", front_stiffeners))
+            circ_booms.append(Boom((r * sin(boom_z / r)), r - (r * cos(boom_z / r)), "Stringer", front_stiffeners-1))
+
+        for boom in reversed(circ_booms):
+            booms.append(boom)
+
+
+        # --- Add leading edge boom
+        booms.append(Boom(0, 0, "Stringer", self.nst+2))
+
+        self.booms = tuple(booms)
+
+        # ______________________________ Creating variables required
+        # --- Calculate spar-stringer skin length (trailing edge side)
+        self.booms_z_positions = []
+        self.booms_y_positions = []
+
+        for boom in booms:
+            self.booms_z_positions.append(boom.z_location)
+            self.booms_y_positions.append(boom.y_location)
+
+        for i in range(len(booms)):
+            if booms[i].type == "Spar":
+                spar_label = booms[i].label
+                prev_boom_label = booms[i-2].label
+
+                spar_loc = self.booms_z_positions[i]
+                prev_boom_loc = self.booms_z_positions[i-2]
+
+        # print("prev_boom_loc", prev_boom_loc, prev_boom_label)
+        # print("spar_loc", spar_loc, spar_label)
+
+        self.small_pitch = (prev_boom_loc-spar_loc)/cos(self.angle_tail)
+        self.large_pitch = self.stiffener_pitch-self.small_pitch
+
+        # --- List stringers z locations
+        self.z_positions_stringers = []
+        self.y_positions_stringers = []
+
+        for boom in booms:
+            if boom.type == "Stringer":
+                self.z_positions_stringers.append(boom.z_location)
+                self.y_positions_stringers.append(boom.y_location)
+        return
+
+    def construct_panels(self):
+        """
+        Build the panel connectivity graph of the boom structure (any odd number of stringers).
+
+        Every cell is walked from the bottom spar boom to the top spar boom, in the direction of the open section
+        shear flows: the triangular cell over the trailing edge, the curved cell over the leading edge. The spar is
+        walked upwards. Besides the Panel objects, the graph is stored as index arrays for vectorised use:
+
+        - panel_start, panel_end, panel_length, panel_thickness, panel_cell: panel attributes
+        - open_incidence (panels x booms): open section shear flow per unit boom shear flow increment (cells cut at
+          their first panel)
+        - panel_delta_y, panel_moment_arm: y extent and moment around the bottom spar boom per unit shear flow
+        - cell_twist (2 x panels): rates of twist of the curved and triangular cells per unit panel shear flow,
+          panel_twist their difference
+        - panel_closure (panels x 2): panel shear flows per unit closure shear flow q_s01 (curved cell) and q_s02
+          (triangular cell)
+        - boom_neighbours, boom_weights (booms x 3): booms at the other end of the panels attached to every boom
+          and thickness*length/6 of these panels (boom area idealisation)
+        """
+        booms = self.booms
+        y_pos = np.array(self.booms_y_positions)
+        z_pos = np.array(self.booms_z_positions)
+
+        spar = [i for i in range(len(booms)) if booms[i].type == "Spar"]
+        self.spar_top, self.spar_bottom = spar if y_pos[spar[0]] > 0 else spar[::-1]
+        self.leading_edge_boom = len(booms) - 1
+
+        slanted = range(min(spar))
+        circular = range(max(spar) + 1, self.leading_edge_boom)
+
+        # --- Boom sequences of the cells, from the bottom spar boom to the top spar boom
+        triangular_path = ([self.spar_bottom] + [i for i in reversed(slanted) if y_pos[i] < 0]
+                           + [i for i in slanted if y_pos[i] > 0] + [self.spar_top])
+        curved_path = ([self.spar_bottom] + [i for i in circular if y_pos[i] < 0] + [self.leading_edge_boom]
+                       + [i for i in reversed(circular) if y_pos[i] > 0] + [self.spar_top])
+
+        panels = []
+        for cell, path, end_pitch in [("Triangular", triangular_path, self.small_pitch),
+                                      ("Curved", curved_path, self.large_pitch)]:
+            for k in range(len(path) - 1):
+                length = end_pitch if k in (0, len(path) - 2) else self.stiffener_pitch
+                panels.append(Panel(path[k], path[k+1], length, self.tsk, cell))
+            if cell == "Triangular":
+                panels.append(Panel(self.spar_bottom, self.spar_top, self.ha, self.tsp, "Spar"))
+        self.panels = tuple(panels)
+
+        self.panel_start = np.array([panel.start_boom for panel in panels])
+        self.panel_end = np.array([panel.end_boom for panel in panels])
+        self.panel_length = np.array([panel.length for panel in panels])
+        self.panel_thickness = np.array([panel.thickness for panel in panels])
+        self.panel_cell = np.array([panel.cell for panel in panels])
+
+        triangular = self.panel_cell == "Triangular"
+        curved = self.panel_cell == "Curved"
+        spar_panel = self.panel_cell == "Spar"
+
+        # --- Open section shear flows: cumulated boom increments along each cell, the spar carries the increment of
+        # --- the bottom spar boom
+        self.open_incidence = np.zeros((len(panels), len(booms)))
+        for cell in (triangular, curved):
+            index = np.flatnonzero(cell)
+            for k in range(1, len(index)):
+                self.open_incidence[index[k]] = self.open_incidence[index[k-1]]
+                self.open_incidence[index[k], self.panel_start[index[k]]] += 1
+        self.open_incidence[spar_panel, self.spar_bottom] = 1
+
+        # --- Geometry of the panels, moments around the bottom spar boom (CCW positive)
+        self.panel_delta_y = y_pos[self.panel_end] - y_pos[self.panel_start]
+        self.panel_moment_arm = (z_pos[self.panel_start] - z_pos[self.spar_bottom])*self.panel_delta_y \
+            - (y_pos[self.panel_start] - y_pos[self.spar_bottom])*(z_pos[self.panel_end] - z_pos[self.panel_start])
+
+        # --- Rates of twist (clockwise positive) and closure shear flows of the curved and triangular cells
+        flexibility = self.panel_length/self.panel_thickness
+        self.cell_twist = np.vstack([np.where(curved, flexibility, 0.) - np.where(spar_panel, flexibility, 0.),
+                                     -np.where(triangular, flexibility, 0.) + np.where(spar_panel, flexibility, 0.)])
+        self.panel_twist = self.cell_twist[0] - self.cell_twist[1]
+
+        self.panel_closure = np.zeros((len(panels), 2))
+        self.panel_closure[curved, 0] = 1
+        self.panel_closure[triangular, 1] = -1
+        self.panel_closure[spar_panel] = [-1, 1]
+
+        # --- Panels attached to every boom
+        neighbours = [[] for _ in booms]
+        weights = [[] for _ in booms]
+        for panel in panels:
+            for boom, neighbour in [(panel.start_boom, panel.end_boom), (panel.end_boom, panel.start_boom)]:
+                neighbours[boom].append(neighbour)
+                weights[boom].append(panel.thickness*panel.length/6.0)
+
+        self.boom_neighbours = np.array([n + [i]*(3 - len(n)) for i, n in enumerate(neighbours)])
+        self.boom_weights = np.array([w + [0.]*(3 - len(w)) for w in weights])
+        return
+
+    def calc_centroid(self):
+
+        # ca = 605.0  # [mm]     airfoil cord
+        # ha = 205.0  # [mm]     airfoil height
+        # tsk = 1.1  # [mm]      skin thickness
+        # tst = 1.2  # [mm]      stringer thickness
+        # hst = 16.0  # [mm]     height of stringer
+        # wst = 19.0  # [mm]     width of stringer
+
+        # List booms z position
+        z_pos = []
+        for boom in self.booms:
+            if boom.type == "Stringer":
+                z_pos.append(boom.z_location)
+            elif boom.type == "Spar":
+                z_spar = boom.z_location
+
+        a_st = self.wst * self.tst + (self.hst - self.tst) * self.tst  # area of one stiffener
+
+        # Areas and centroids of parts of cross section from leading edge
+        a_circ = np.pi * self.ha * self.tsk / 2  # area of circular section
+        z_circ = self.ha / 2 * (1 - 4 / (3 * np.pi))  # centroid of circular section
+        a_straight = 2 * self.tsk * np.sqrt((self.ca - self.ha / 2) ** 2 + (self.ha / 2) ** 2)  # area of both straight parts
+        z_straight = self.ha / 2 + (self.ca - self.ha / 2) / 2  # centroid of both straight parts
+        a_stiffeners = a_st * len(z_pos)  # area of all stiffeners
+        z_stiffeners = sum(z_pos) / len(z_pos)  # centroid of all stiffeners
+        a_spar = self.ha * self.tsk
+
+        z_centroid = (z_circ * a_circ + z_straight * a_straight + z_stiffeners * a_stiffeners + a_spar * z_spar) / \
+                     (a_circ + a_straight + a_stiffeners + a_spar)
+
+        self.u_centroid = z_centroid
+        return
+
+    def calc_mom_inertia(self):
+        """"Enter lists with the z and y co-ords of the stiffeners and the angle\
+        of the skin in the straight section."""
+
+        stif_z = list(self.z_positions_stringers)
+        stif_y = list(self.y_positions_stringers)
+
+        angle = self.angle_tail
+
+        ail_h = self.ha  # height of the aileron     [mm]
+        ail_w = self.ca  # chord of the aileron      [mm]
+
+        # we'll start off by finding moment of inertia for a stiffener
+        w = self.wst  # width of stiffener        [mm]
+        h = self.hst  # height of stiffener       [mm]
+        t = self.tst  # thickness of stiffener    [mm]
+
+        A_base = w * t  # area of the horiz. part   [mm^2]
+        A_top = h * t  # area of the vert. part    [mm^2]
+        A_stif = A_base + A_top  # area of stiffener         [mm^2]
+        self.area_stiffener = A_stif
+
+        c_y = 0  # centroid y co-ord (symm)  [mm]
+        c_z = self.u_centroid  # centroid z co-ord         [mm]
+        # c_z = ail_h / 2
+
+        stif_zz = 0  # initial value mom inert   [mm^4]
+        stif_yy = 0  # initial value mom inert   [mm^4]
+
+        for i in range(len(stif_y)):
+            if stif_y[i] < 0:
+                stif_y[i] = stif_y[i] + 3
+            elif stif_y[i] > 0:
+                stif_y[i] = stif_y[i] - 3
+
+        for i in range(len(stif_z)):
+            stif_z[i] = stif_z[i] - c_z
+
+        # now calculate the Steiner terms for all stiffeners
+        for i in range(len(stif_z)):
+            stein_z = A_stif * (stif_z[i]) ** 2
+            stif_yy = stif_yy + stein_z
+
+        for i in range(len(stif_y)):
+            stein_y = A_stif * (stif_y[i]) ** 2
+            stif_zz = stif_zz + stein_y
+
+        skin_t = self.tsk  # skin thickness        [mm]
+        skin_l = np.sqrt((ail_w - (ail_h / 2)) ** 2 + (ail_h / 2) ** 2)  # skin length           [mm]
+
+        # add the moment of inertia for the straight part of the skin
+        skin_zz1 = ((skin_t * (skin_l / 2) ** 3) * np.sin(angle) ** 2) / 12
+        skin_yy1 = ((skin_t * (skin_l / 2) ** 3) * np.cos(angle) ** 2) / 12
+        skin_stein_1a = skin_t * skin_l * (np.cos(angle) * skin_l / 2) ** 2
+        skin_stein_1b = skin_t * skin_l * (np.sin(angle) * skin_l / 2) ** 2
+
+        skin_zz2 = ((skin_t * (skin_l / 2) ** 3) * np.sin(angle) ** 2) / 12
+        skin_yy2 = ((skin_t * (skin_l / 2) ** 3) * np.cos(angle) ** 2) / 12
+        skin_stein_2a = skin_t * skin_l * (np.cos(angle) * skin_l / 2) ** 2
+        skin_stein_2b = skin_t * skin_l * (-np.sin(angle) * skin_l / 2) ** 2
+
+        skin_zz = skin_zz1 + skin_zz2 + skin_stein_1b + skin_stein_2b
+        skin_yy = skin_yy1 + skin_yy2 + skin_stein_1a + skin_stein_2a
+
+        z_out = (ail_h / 2) - (4 * ail_h / 2) / (3 * np.pi)  # centroid outer        [mm]
+        z_in = (ail_h / 2) - (4 * (ail_h - skin_t) / 2) / (3 * np.pi)  # centroid inner        [mm]
+        A_out = (np.pi * (ail_h / 2) ** 2) / 2  # area outer circ       [mm^2]
+        A_in = (np.pi * ((ail_h - skin_t) / 2) ** 2) / 2  # area inner circ       [mm^2]
+        circ_z = (A_out * z_out + A_in * z_in) / (A_out + A_in)  # centroid z            [mm]
+
+        # add the moment of inertia for the circular part of the skin
+        circ_zz = A_out * (ail_h / 2) ** 2 / 4 - A_in * ((ail_h - skin_t) / 2) ** 2 / 4
+        circ_yy = A_out * (ail_h / 2) ** 2 / 4 - A_in * ((ail_h - skin_t) / 2) ** 2 / 4
+        circ_stein = (A_in + A_out) * (circ_z - c_z) ** 2
+
+        spar_z = ail_h / 2  # centroid of the spar      [mm]
+        spar_h = ail_h  # height of the spar        [mm]
+        spar_t = self.tsp  # thickness of spar         [mm]
+
+        # finally, add the moment of inertia for the spar
+        spar_zz = (spar_h * spar_t ** 3) / 12
+        spar_yy = (spar_t * spar_h ** 3) / 12
+        spar_stein = spar_h * spar_t * (spar_z - c_z) ** 2
+
+        # then add all the moment of inertia together
+        I_u = stif_zz + skin_zz + circ_zz + spar_zz
+        I_v = stif_yy + skin_yy + circ_yy + circ_stein + spar_yy + spar_stein
+
+        # now switch to the new axis system
+        phi = np.radians(self.theta)  # aileron rot angle         [rad]
+        I_zz = (I_u + I_v) / 2 + ((I_u - I_v) / 2) * np.cos(2 * phi)
+        I_yy = (I_u + I_v) / 2 - ((I_u - I_v) / 2) * np.cos(2 * phi)
+        J = I_yy + I_zz
+
+        self.I_u = I_u
+        self.I_v = I_v
+
+        self.I_zz = I_zz
+        self.I_yy = I_yy
+
+        self.polar_I_uv = self.I_u + self.I_v
+        self.polar_I_zy = self.I_zz + self.I_yy
+        return
+
+    def calc_boom_areas(self):
+        """
+        Idealised boom areas for bending about the u axis (direct stress proportional to y), the load independent
+        areas used for the shear center and the span-wide shear flow field.
+        """
+        y_pos = np.array(self.booms_y_positions)
+
+        # --- Direct stress ratio of the attached panels, the leading edge boom (y = 0) sits between two
+        # --- opposite stresses
+        with np.errstate(divide="ignore", invalid="ignore"):
+            stress_ratio = y_pos[self.boom_neighbours]/y_pos[:, None]
+        stress_ratio[y_pos == 0] = -1.
+
+        self.boom_stringer_area = np.where([boom.type == "Stringer" for boom in self.booms], self.area_stiffener, 0.)
+        self.boom_areas = np.sum(self.boom_weights*(2 + stress_ratio), axis=1) + self.boom_stringer_area
+        return
+
+    def calc_shear_center(self):
+        """
+        Locate the shear center on the symmetry axis: the open section shear flows of a shear force in y direction
+        are closed with zero rate of twist in both cells, and the moment of the resulting shear flows around the
+        bottom spar boom gives the line of action of the shear force.
+        """
+        y_pos = np.array(self.booms_y_positions)
+        z_spar = self.booms_z_positions[self.spar_bottom]
+
+        q_open = self.open_incidence @ (-self.boom_areas*y_pos)
+
+        # --- Closure shear flows for zero rate of twist in both cells
+        q_s0 = np.linalg.solve(self.cell_twist @ self.panel_closure, -(self.cell_twist @ q_open))
+        q = q_open + self.panel_closure @ q_s0
+
+        self.shear_center_u = z_spar + (q @ self.panel_moment_arm)/(q @ self.panel_delta_y)
+
+    def calc_panel_properties(self):
+        """
+        Panel constants, closure inverse and unit load shear flow solutions of the cross-section (see
+        shear_flow_calculations.calc_panel_properties), stored with the geometry they depend on.
+        """
+        # --- Imported here, shear_flow_calculations imports this module
+        from src.shear_flow_calculations import calc_panel_properties
+        self.panel_properties = calc_panel_properties(self)
+
+    def plot_boom_structure(self):
+        import matplotlib.pyplot as plt
+
+        label_stringer = []
+
+        z_spar = []
+        y_spar = []
+        label_spar = []
+
+        for i in range(len(self.booms)):
+            if self.booms[i].type == "Stringer":
+                label_stringer.append(self.booms[i].label)
+            elif self.booms[i].type == "Spar":
+                z_spar.append(self.booms[i].z_location)
+                y_spar.append(self.booms[i].y_location)
+                label_spar.append(self.booms[i].label)
+
+        plt.scatter(self.z_positions_stringers, self.y_positions_stringers, color='b', label="Stringers")
+        plt.scatter(z_spar, y_spar, color='r', label="Spar")
+
+        for i, txt in enumerate(label_stringer):
+            plt.annotate(txt, (self.z_positions_stringers[i], self.y_positions_stringers[i]))
+
+        for i, txt in enumerate(label_spar):
+            plt.annotate(txt, (z_spar[i], y_spar[i]))
+
+        i = 1
+        upper_half_z = [self.ca]
+        upper_half_y = [0]
+
+        lower_half_z = [self.ca]
+        lower_half_y = [0]
+
+        while i < len(self.booms_z_positions):
+            upper_half_y.append(self.booms_y_positions[i-1])
+            upper_half_z.append(self.booms_z_positions[i-1])
+
+            lower_half_y.append(self.booms_y_positions[i])
+            lower_half_z.append(self.booms_z_positions[i])
+
+            i += 2
+
+        upper_half_y.append(0)
+        upper_half_z.append(0)
+
+        lower_half_y.append(0)
+        lower_half_z.append(0)
+
+        plt.plot(upper_half_z, upper_half_y, color="g")
+        plt.plot(lower_half_z, lower_half_y, color="g")
+
+        plt.title("Cross-section boom structure of the aileron")
+        plt.xlabel("x (mm)")
+        plt.ylabel("y (mm)")
+
+        plt.legend()
+        plt.grid()
+        plt.axis("equal")
+        plt.show()
+
+    def __repr__(self):
+        return "Cross section " + str(geometry_key(self))
+
+
+def geometry_key(source=None):
+    """
+    Return the tuple of geometry parameters identifying a cross-section.
+
+    :param source: Object holding the geometry parameters as attributes (current AileronConfig by default)
+    :return: Tuple of the GEOMETRY_PARAMETERS values
+    """
+    return tuple(getattr(get_config(source), name) for name in GEOMETRY_PARAMETERS)
+
+
+def get_cross_section(cfg=None):
+    """
+    Return the cross-section matching a configuration, building it only once per geometry.
+
+    The cache is keyed on the geometry parameters themselves, so configurations differing only by their
+    loads share the same cross-section, and any geometry change yields a new one.
+
+    :param cfg: AileronConfig (current values in config.py by default)
+    """
+    key = geometry_key(get_config(cfg))
+
+    if key not in _cross_section_cache:
+        with timer("Cross_section"):
+            _cross_section_cache[key] = Cross_section(*key)
+
+    return _cross_section_cache[key]
+
+
+def clear_cross_section_cache():
+    _cross_section_cache.clear()
@@ -0,0 +1,13 @@
+class Panel:
+    def __init__(self, start_boom, end_boom, length, thickness, cell, label=None):
+        self.label = label
+        self.cell = cell
+
+        self.start_boom = start_boom
+        self.end_boom = end_boom
+
+        self.length = length
+        self.thickness = thickness
+
+    def __repr__(self):
+        return "Panel " + str(self.start_boom) + "-" + str(self.end_boom) + " (" + self.cell + ")"
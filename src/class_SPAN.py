@@ -0,0 +1,217 @@
+from src.class_SLICE import Simple_slice, Rib
+from src.class_CROSS_SECTION import get_cross_section
+from src.class_CONFIG import get_config
+from src.shear_flow_calculations import section_loads, shear_flow_field
+from src.stress_calculations import direct_stress_field
+from src.von_mises_calculations import von_mises_blocks
+from src.deflection_calculations import deflection_calc
+from src.tools_profiling import profiled
+import numpy as np
+
+
+class SpanModel:
+    """
+    Column-oriented discretisation of the aileron span.
+
+    Every quantity is stored as one NumPy array indexed by station (sorted by x location), instead of
+    one Slice object per station. Point loads only exist at the feature stations (ribs and hinged slice),
+    so they are stored per feature alongside the feature station indices.
+    """
+    def __init__(self, x_location, feature_index=(), feature_labels=(), feature_types=(),
+                 feature_deflection=None, feature_x_load=None, feature_y_load=None, feature_z_load=None, cfg=None):
+
+        self.cfg = get_config(cfg)
+
+        self.x_location = np.asarray(x_location, dtype=float)
+        n_stations = len(self.x_location)
+
+        # --- Features (ribs A-D, hinged slice)
+        self.feature_index = np.asarray(feature_index, dtype=np.intp)
+        n_features = len(self.feature_index)
+
+        self.feature_labels = tuple(feature_labels)
+        self.feature_types = tuple(feature_types)
+
+        self.feature_deflection = self._feature_array(feature_deflection, n_features)
+        self.feature_x_load = self._feature_array(feature_x_load, n_features)
+        self.feature_y_load = self._feature_array(feature_y_load, n_features)
+        self.feature_z_load = self._feature_array(feature_z_load, n_features)
+
+        # --- Internal loads per station
+        self.y_internal_load = np.zeros(n_stations)
+        self.z_internal_load = np.zeros(n_stations)
+
+        self.y_internal_moment = np.zeros(n_stations)
+        self.z_internal_moment = np.zeros(n_stations)
+
+        self.x_torque = np.zeros(n_stations)
+        self.displacement_theta = np.zeros(n_stations)
+
+    @staticmethod
+    def _feature_array(values, n_features):
+        if values is None:
+            return np.zeros(n_features)
+        return np.asarray(values, dtype=float)
+
+    @classmethod
+    def from_slices(cls, model, cfg=None):
+        """
+        Build a span model from a list of Slice objects sorted by x location.
+
+        :param model: List of Simple_slice, Rib and Hinged_slice instances
+        :param cfg: AileronConfig of the model (current values in config.py by default)
+        :return: SpanModel instance
+        """
+        feature_index = [i for i in range(len(model)) if type(model[i]) is not Simple_slice]
+        features = [model[i] for i in feature_index]
+
+        span = cls([slice_point.x_location for slice_point in model],
+                   feature_index=feature_index,
+                   feature_labels=[feature.label for feature in features],
+                   feature_types=[type(feature) for feature in features],
+                   feature_deflection=[getattr(feature, "deflection", 0) for feature in features],
+                   feature_x_load=[feature.x_load for feature in features],
+                   feature_y_load=[feature.y_load for feature in features],
+                   feature_z_load=[feature.z_load for feature in features],
+                   cfg=cfg)
+
+        for i, slice_point in enumerate(model):
+            span.y_internal_load[i] = slice_point.y_internal_load
+            span.z_internal_load[i] = slice_point.z_internal_load
+            span.y_internal_moment[i] = slice_point.y_internal_moment
+            span.z_internal_moment[i] = slice_point.z_internal_moment
+            span.x_torque[i] = slice_point.x_torque
+            span.displacement_theta[i] = slice_point.displacement_theta
+
+        return span
+
+    @classmethod
+    @profiled
+    def from_features(cls, features, la, nb_of_slices, cfg=None, grid=None):
+        """
+        Build a span model made of a uniform grid of simple slices with the features merged in.
+
+        The grid is generated sorted, and the features are inserted at the positions found by binary search,
+        so the stations come out ordered without sorting the whole model. A feature located exactly on a grid
+        station is placed before it.
+
+        :param features: List of Rib and Hinged_slice instances (any order)
+        :param la: Span of the aileron
+        :param nb_of_slices: Number of simple slices of the uniform grid
+        :param cfg: AileronConfig of the model (current values in config.py by default)
+        :param grid: Sorted simple slice x locations replacing the uniform grid (e.g. tools_mesh.adaptive_mesh),
+                     grid stations located exactly on a feature are replaced by the feature
+        :return: SpanModel instance
+        """
+        features = sorted(features, key=lambda feature: feature.x_location)
+        feature_x = np.array([feature.x_location for feature in features], dtype=float)
+
+        if grid is None:
+            grid = np.linspace(0, la, nb_of_slices)
+        else:
+            grid = np.asarray(grid, dtype=float)
+            grid = grid[~np.isin(grid, feature_x)]
+        insert_index = np.searchsorted(grid, feature_x, side="left")
+
+        return cls(np.insert(grid, insert_index, feature_x),
+                   feature_index=insert_index + np.arange(len(features)),
+                   feature_labels=[feature.label for feature in features],
+                   feature_types=[type(feature) for feature in features],
+                   feature_deflection=[getattr(feature, "deflection", 0) for feature in features],
+                   feature_x_load=[feature.x_load for feature in features],
+                   feature_y_load=[feature.y_load for feature in features],
+                   feature_z_load=[feature.z_load for feature in features],
+                   cfg=cfg)
+
+    def __len__(self):
+        return len(self.x_location)
+
+    def __repr__(self):
+        return "Span model (" + str(len(self)) + " stations, " + str(len(self.feature_index)) + " features)"
+
+    @property
+    def cross_section(self):
+        return get_cross_section(self.cfg)
+
+    @property
+    def feature_x_location(self):
+        return self.x_location[self.feature_index]
+
+    @property
+    def x_separation(self):
+        return np.diff(self.x_location)
+
+    @property
+    def nbytes(self):
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+    def point_loads(self, component):
+        """
+        Return the dense point load array of one component ("x", "y" or "z") over all stations.
+        """
+        loads = np.zeros(len(self))
+        np.add.at(loads, self.feature_index, getattr(self, "feature_" + component + "_load"))
+        return loads
+
+    def shear_flow_field(self):
+        """
+        Return the shear flow in every panel of the cross-section at every station (stations x panels, see
+        cross_section.panels), from the internal loads and torque stored in the model.
+        """
+        Sy, Sz, _, _ = section_loads(self.y_internal_load, self.z_internal_load, 0., 0., self.cfg.theta)
+        return shear_flow_field(self.cross_section, Sy, Sz, self.x_torque)
+
+    def direct_stress_field(self):
+        """
+        Return the direct (bending) stress in every boom at every station (stations x booms), from the internal
+        moments stored in the model.
+        """
+        _, _, My, Mz = section_loads(0., 0., self.y_internal_moment, self.z_internal_moment, self.cfg.theta)
+        return direct_stress_field(self.cross_section, My, Mz)
+
+    def von_mises_blocks(self, block_size=100000):
+        """
+        Stream the Von Mises stress at every boom and panel of every station, by blocks of stations
+        (see von_mises_calculations.von_mises_blocks).
+        """
+        Sy, Sz, My, Mz = section_loads(self.y_internal_load, self.z_internal_load,
+                                       self.y_internal_moment, self.z_internal_moment, self.cfg.theta)
+        return von_mises_blocks(self.cross_section, Sy, Sz, My, Mz, self.x_torque, self.x_location, block_size)
+
+    def deflection(self, solution=None):
+        """
+        Return the leading edge, trailing edge and hinge line displacements at every station (Deflection named tuple,
+        see deflection_calculations.deflection_calc), from the aileron angle stored in the model.
+
+        :param solution: Hinge line deflection of the iterative force solvers (see analysis.reaction_forces), closed
+                         form solution by default
+        """
+        return deflection_calc(self.x_location, self.displacement_theta, self.cfg, solution)
+
+    def feature_slice(self, k):
+        """
+        Create the Slice object of feature k, loaded with the internal loads stored at its station.
+
+        :param k: Feature number (0 to number of features - 1)
+        :return: Rib or Hinged_slice instance
+        """
+        i = self.feature_index[k]
+        feature_type = self.feature_types[k]
+
+        if feature_type is Rib:
+            feature = Rib(self.feature_labels[k], self.x_location[i], deflection=self.feature_deflection[k],
+                          x_load=self.feature_x_load[k], y_load=self.feature_y_load[k], z_load=self.feature_z_load[k],
+                          cfg=self.cfg)
+        else:
+            feature = feature_type(self.feature_labels[k], self.x_location[i],
+                                   x_load=self.feature_x_load[k], y_load=self.feature_y_load[k], z_load=self.feature_z_load[k],
+                                   cfg=self.cfg)
+
+        feature.y_internal_load = self.y_internal_load[i]
+        feature.z_internal_load = self.z_internal_load[i]
+        feature.y_internal_moment = self.y_internal_moment[i]
+        feature.z_internal_moment = self.z_internal_moment[i]
+        feature.x_torque = self.x_torque[i]
+        feature.displacement_theta = self.displacement_theta[i]
+
+        return feature
@@ -0,0 +1,50 @@
+import numpy as np
+from collections import namedtuple
+
+import src.force_calculations_v2 as fc
+from src.class_CONFIG import get_config
+from src.tools_profiling import profiled
+
+Deflection = namedtuple("Deflection", ["le_y", "le_z", "te_y", "te_z", "hinge_y", "hinge_z"])
+
+
+@profiled
+def deflection_calc(x_pos, theta_deg, cfg=None, solution=None):
+    """
+    Calculate the leading edge, trailing edge and hinge line displacements at every station in one pass.
+
+    The hinge line deflects with the bending solution of the force solvers: the closed form solution (Y_deflection
+    and Z_deflection) by default, or the integrated deflection of the iterative Y_force and Z_force solution
+    (interpolated to the stations) when given. The leading and trailing edges follow the hinge line, and rotate around it with
+    the change of aileron angle from its nominal value (theta in the configuration, positive trailing edge down).
+
+    :param x_pos: Station x locations
+    :param theta_deg: Aileron angle at the stations (degrees, see moment_calc)
+    :param cfg: AileronConfig (current values in config.py by default)
+    :param solution: Hinge line deflection of the iterative force solvers on their own stations (dictionary of
+                     y_x_pos, y_disp, z_x_pos and z_disp arrays, see analysis.reaction_forces), None or empty for
+                     the closed form solution
+    :return: Deflection named tuple of y (positive up) and z (positive towards the trailing edge) displacement arrays
+    """
+    cfg = get_config(cfg)
+    x_pos = np.asarray(x_pos, dtype=float)
+
+    if solution:
+        hinge_y = np.interp(x_pos, solution["y_x_pos"], solution["y_disp"])
+        hinge_z = np.interp(x_pos, solution["z_x_pos"], solution["z_disp"])
+    else:
+        hinge_y = fc.Y_deflection(x_pos, cfg)
+        hinge_z = fc.Z_deflection(x_pos, cfg)
+
+    # --- Displacement per unit chordwise distance from the hinge line, due to the twist
+    theta = np.radians(theta_deg)
+    theta_0 = np.radians(cfg.theta)
+    twist_y = -(np.sin(theta) - np.sin(theta_0))
+    twist_z = np.cos(theta) - np.cos(theta_0)
+
+    le_arm = -cfg.ha/2              # [mm] leading edge ahead of the hinge line
+    te_arm = cfg.ca - cfg.ha/2      # [mm] trailing edge behind the hinge line
+
+    return Deflection(hinge_y + le_arm*twist_y, hinge_z + le_arm*twist_z,
+                      hinge_y + te_arm*twist_y, hinge_z + te_arm*twist_z,
+                      hinge_y, hinge_z)
@@ -1,231 +1,383 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from src.class_SLICE import Slice
+from collections import namedtuple
+from src.class_CROSS_SECTION import get_cross_section, geometry_key, GEOMETRY_PARAMETERS
+from src.class_CONFIG import get_config
+from src.tools_integration import integrate_beam, adjust_deflection
+from src.tools_profiling import profiled, timer, count
 
-from config import *
 #get_ipython().run_line_magic('matplotlib','qt')
 
 # CONSTANTS #
-cross_section = Slice()
+SOLVER_VERSION = 3    # increment when a change to the solvers alters their results (invalidates cached results)
+MAX_ITERATIONS = 1000    # iterations of the iterative solvers before giving up
 
-theta_max = theta*np.pi/180    # [rad]
-P = p
+# --- Configuration values read by the reaction force solvers, directly or through the cross-section
+SOLVER_PARAMETERS = GEOMETRY_PARAMETERS + ("la", "x1", "x2", "x3", "xa", "q", "d1", "d3", "E", "p")
 
-I1_zz = cross_section.I_zz    # [mm**4]
-I1_yy = cross_section.I_yy    # [mm**4]
+Solver_constants = namedtuple("Solver_constants", ["theta_max", "P", "I1_zz", "I1_yy", "sc", "hinge", "act",
+                                                   "arm_a", "arm_q", "arm_y", "arm_z", "h_arm_a", "h_arm_q"])
 
-sc = cross_section.shear_center_u     # [mm] shear center distance from LE
-hinge = ha/2
-act = hinge*np.sqrt(2)
+_constants_cache = {}
 
-arm_a = act*np.sin(np.pi/4-theta_max)-(sc - hinge)*np.sin(theta_max) 
-arm_q = (ca/4-sc)*np.cos(theta_max) 
-arm_y = (sc-hinge)*np.cos(theta_max)
-arm_z = (sc-hinge)*np.sin(theta_max)
 
-h_arm_a = act*np.sin(np.pi/4-theta_max)
-h_arm_q = (ca/4-hinge)*np.cos(theta_max)
+class ConvergenceError(RuntimeError):
+    """
+    Raised when an iterative solver does not converge within MAX_ITERATIONS iterations, or diverges.
+    """
 
-def Y_force(n_steps=1000, plot=True, info=True, ret=False):
+
+def solver_key(source=None):
+    """
+    Return the tuple of configuration values the reaction forces depend on.
+
+    :param source: Object holding the parameters as attributes (current AileronConfig by default)
+    :return: Tuple of the SOLVER_PARAMETERS values
+    """
+    return tuple(getattr(get_config(source), name) for name in SOLVER_PARAMETERS)
+
+
+def solver_constants(cfg=None):
+    """
+    Return the cross-section dependent constants of the solvers (moments of inertia, shear center, lever arms)
+    for a configuration. They are only computed on first use, once per configuration.
+
+    :param cfg: AileronConfig (current values in config.py by default)
+    """
+    cfg = get_config(cfg)
+    key = geometry_key(cfg) + (cfg.p,)
+
+    if key not in _constants_cache:
+        cross_section = get_cross_section(cfg)
+
+        theta_max = cfg.theta*np.pi/180    # [rad]
+        P = cfg.p
+
+        I1_zz = cross_section.I_zz    # [mm**4]
+        I1_yy = cross_section.I_yy    # [mm**4]
+
+        sc = cross_section.shear_center_u     # [mm] shear center distance from LE
+        hinge = cfg.ha/2
+        act = hinge*np.sqrt(2)
+
+        arm_a = act*np.sin(np.pi/4-theta_max)-(sc - hinge)*np.sin(theta_max)
+        arm_q = (cfg.ca/4-sc)*np.cos(theta_max)
+        arm_y = (sc-hinge)*np.cos(theta_max)
+        arm_z = (sc-hinge)*np.sin(theta_max)
+
+        h_arm_a = act*np.sin(np.pi/4-theta_max)
+        h_arm_q = (cfg.ca/4-hinge)*np.cos(theta_max)
+
+        _constants_cache[key] = Solver_constants(theta_max, P, I1_zz, I1_yy, sc, hinge, act,
+                                                 arm_a, arm_q, arm_y, arm_z, h_arm_a, h_arm_q)
+
+    return _constants_cache[key]
+
+
+def __getattr__(name):
+    # --- Lazy module level access to the constants (e.g. force_calculations_v2.I1_zz)
+    if name in Solver_constants._fields:
+        return getattr(solver_constants(), name)
+    raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+
+
+def macaulay(x, a, n):
+    """
+    Macaulay step function <x-a>^n, zero for x <= a (vectorised over x).
+    """
+    x = np.asarray(x, dtype=float)
+    return np.where(x > a, (x - a)**n, 0.)
+
+
+def _Y_direct_solution(cfg=None):
+    """
+    Solve the statically indeterminate y direction problem in a single linear solve.
+
+    The deflection is written with Macaulay step functions:
+    E*I*y(x) = -(q*x^4/24 - F1*<x-x1>^3/6 + F2*<x-x2>^3/6 - F3*<x-x3>^3/6) + C1*x + C2
+    Unknowns F1, F2, F3, C1, C2 follow from the two equilibrium equations and the three
+    compatibility conditions y(x1) = d1, y(x2) = 0 and y(x3) = d3.
+
+    :param cfg: AileronConfig (current values in config.py by default)
+    :return: F1, F2, F3, C1, C2 (F same sign convention as Y_force)
+    """
+    cfg = get_config(cfg)
+    la, x1, x2, x3, q, d1, d3, E = cfg.la, cfg.x1, cfg.x2, cfg.x3, cfg.q, cfg.d1, cfg.d3, cfg.E
+    I1_zz = solver_constants(cfg).I1_zz
+
+    EI = E*I1_zz
+
+    A = [[-(x2-x1), 0, (x3-x2), 0, 0],      # Moment equilibrium around x2
+         [-1, 1, -1, 0, 0]]                 # Force equilibrium
+    B = [q*la*(la/2-x2),
+         -q*la]
+
+    for x, d in [(x1, d1), (x2, 0), (x3, d3)]:
+        A.append([macaulay(x, x1, 3)/6, -macaulay(x, x2, 3)/6, macaulay(x, x3, 3)/6, x, 1])
+        B.append(EI*d + q*x**4/24)
+
+    F1, F2, F3, C1, C2 = np.linalg.solve(np.array(A, dtype=float), np.array(B, dtype=float))
+    return F1, F2, F3, C1, C2
+
+
+def Y_force_direct(cfg=None):
+    """
+    Solve the y direction reaction forces in a single linear solve (see _Y_direct_solution).
+
+    :return: F1, F2, F3 (same sign convention as Y_force)
+    """
+    return _Y_direct_solution(cfg)[:3]
+
+
+def Z_force_direct(cfg=None):
+    """
+    Solve the statically indeterminate z direction problem in a single linear solve.
+
+    The deflection is written with Macaulay step functions:
+    E*I*z(x) = (F1*<x-x1>^3 + R*<x-xa1>^3 + F2*<x-x2>^3 + P*<x-xa2>^3 + F3*<x-x3>^3)/6 + C1*x + C2
+    Unknowns F1, R, F2, F3, C1, C2 follow from the three equilibrium equations (force, torque around
+    the hinge line and moment around x1) and the three compatibility conditions z(x1) = z(x2) = z(x3) = 0.
+
+    :param cfg: AileronConfig (current values in config.py by default)
+    :return: F1, R, F2, F3, C1, C2 (same sign convention as Z_force, C1 and C2 in N*mm^2 and N*mm^3)
+    """
+    cfg = get_config(cfg)
+    la, x1, x2, x3, xa, q = cfg.la, cfg.x1, cfg.x2, cfg.x3, cfg.xa, cfg.q
+    constants = solver_constants(cfg)
+    P, h_arm_a, h_arm_q = constants.P, constants.h_arm_a, constants.h_arm_q
+
+    xa1 = x2 - xa/2
+    xa2 = x2 + xa/2
+
+    A = [[1, 1, 1, 1, 0, 0],                                # Force equilibrium
+         [0, h_arm_a, 0, 0, 0, 0],                          # Torque equilibrium around the hinge line
+         [0, (xa1-x1), (x2-x1), (x3-x1), 0, 0]]             # Moment equilibrium around x1
+    B = [-P,
+         -P*h_arm_a - q*la*h_arm_q,
+         -P*(xa2-x1)]
+
+    for x in [x1, x2, x3]:
+        A.append([macaulay(x, x1, 3)/6, macaulay(x, xa1, 3)/6, macaulay(x, x2, 3)/6, macaulay(x, x3, 3)/6, x, 1])
+        B.append(-P*macaulay(x, xa2, 3)/6)
+
+    return tuple(np.linalg.solve(np.array(A, dtype=float), np.array(B, dtype=float)))
+
+
+def Y_deflection(x, cfg=None):
+    """
+    Deflection of the hinge line in y direction at the x locations, from the closed form solution of the
+    direct solver (vectorised over x).
+
+    :param x: x locations (array)
+    :param cfg: AileronConfig (current values in config.py by default)
+    :return: y deflection array (mm)
+    """
+    cfg = get_config(cfg)
+    F1, F2, F3, C1, C2 = _Y_direct_solution(cfg)
+    x = np.asarray(x, dtype=float)
+
+    return (-(cfg.q*x**4/24 - F1*macaulay(x, cfg.x1, 3)/6 + F2*macaulay(x, cfg.x2, 3)/6 - F3*macaulay(x, cfg.x3, 3)/6)
+            + C1*x + C2)/(cfg.E*solver_constants(cfg).I1_zz)
+
+
+def Z_deflection(x, cfg=None):
+    """
+    Deflection of the hinge line in z direction at the x locations, from the closed form solution of the
+    direct solver (vectorised over x).
+
+    :param x: x locations (array)
+    :param cfg: AileronConfig (current values in config.py by default)
+    :return: z deflection array (mm)
+    """
+    cfg = get_config(cfg)
+    F1, R, F2, F3, C1, C2 = Z_force_direct(cfg)
+    P = solver_constants(cfg).P
+    x = np.asarray(x, dtype=float)
+
+    xa1 = cfg.x2 - cfg.xa/2
+    xa2 = cfg.x2 + cfg.xa/2
+
+    return ((F1*macaulay(x, cfg.x1, 3) + R*macaulay(x, xa1, 3) + F2*macaulay(x, cfg.x2, 3) + P*macaulay(x, xa2, 3)
+             + F3*macaulay(x, cfg.x3, 3))/6 + C1*x + C2)/(cfg.E*solver_constants(cfg).I1_yy)
+
+
+def _stations(x_pos, n_steps, la, x_features):
+    """
+    Return the integration stations of the iterative solvers, the station index at which each point load
+    (located at x_features) is applied, i.e. the first station past the load, and the integration rule.
+
+    The uniform grid keeps the rectangle rule the solvers were validated with, stations given by the caller
+    (e.g. tools_mesh.adaptive_mesh) are integrated with the second order trapezoidal rule.
+
+    :param x_pos: Sorted station x locations from 0 to la (uniform or not), None for the uniform grid of n_steps steps
+    :return: x_pos array, list of station indices, integration rule
+    """
+    if x_pos is None:
+        dx = la/(n_steps)
+        return np.arange(0, la+1, dx), [int(n_steps*x/la)+1 for x in x_features], "rectangle"
+
+    x_pos = np.asarray(x_pos, dtype=float)
+    return x_pos, [int(i) for i in np.searchsorted(x_pos, x_features, side="right")], "trapezoid"
+
+
+@profiled
+def Y_force(n_steps=1000, plot=True, info=True, ret=False, method="iterative", cfg=None, x_pos=None, solution=None):
+
+    # CONSTANTS #
+    cfg = get_config(cfg)
+    la, x1, x2, x3, xa, q, d1, d3, E = cfg.la, cfg.x1, cfg.x2, cfg.x3, cfg.xa, cfg.q, cfg.d1, cfg.d3, cfg.E
+    I1_zz = solver_constants(cfg).I1_zz
 
     # INITIATION #
-    dx = la/(n_steps)
-    x_pos = np.arange(0, la+1, dx)
-    n_x1 = int(n_steps*x1/la)+1
-    n_x2 = int(n_steps*x2/la)+1
-    n_x3 = int(n_steps*x3/la)+1
+    x_pos, (n_x1, n_x2, n_x3), rule = _stations(x_pos, n_steps, la, [x1, x2, x3])
     xa1 = x2 - xa/2
     xa2 = x2 + xa/2
-       
-    F1 = 25000 # [N] - INITIAL GUESS
-    correction = 0
-    error = 100
-    itteration = 0
-    itteration_factor = 0.03 # 0.03 works very well
-    y0 = 0
-    a0 = 0
-    
-    # ITTERATION IN Y DIRECTION #
-    while abs(error) >= 10**-10: # [mm]
-        itteration += 1
-        
-        shear = [0]*len(x_pos)
-        moment = [0]*len(x_pos)
-        y_disp = [0]*len(x_pos)
-        angle = [0]*len(x_pos)
-        
-        y_disp[0] = y0
-        angle[0] = a0
-        
-        F1 += correction
-        F3 = (F1*(x2-x1) + q*la*(la/2-x2))/(x3-x2)
-        F2 = F1 + F3 - q*la
-        
-        for i in range(1, n_steps+1):
-                        
-            # SHEAR INTEGRATION #        
-            shear[i]=shear[i-1] + q*dx        
-            if i == n_x1:
-                shear[i] = shear[i] - F1
-            if i == n_x2:
-                shear[i] = shear[i] + F2
-            if i == n_x3:
-                shear[i] = shear[i] - F3
-                
-            # MOMENT INTEGRATION #    
-            moment[i] = moment[i-1] - shear[i]*dx
-            
-            # ANGLE INTEGRATION #
-            angle[i] = angle[i-1] + moment[i]*dx/(E*I1_zz)
-            
-            # DISPLACEMENT INTEGRATION #
-            y_disp[i] = y_disp[i-1] + angle[i]*dx
-        
-        # DISPLACEMENT AND ANGLE ADJUSTMENT #
-        x2_adjustment = - y_disp[n_x2]
-        x3_adjustment = - y_disp[n_x3] + d3 +y_disp[n_x2]
-        angle_adjustment = x3_adjustment/(x3-x2)
-        for i in range(0, n_steps+1):
-            y_disp[i] = y_disp[i] + x2_adjustment + x3_adjustment*(x_pos[i]-x2)/(x3-x2)
-            angle[i] = angle[i] + angle_adjustment
-            
-        correction = F1*(d1 - y_disp[n_x1])*itteration_factor
-        y0 = y_disp[0]
-        a0 = angle[0]
-        error = y_disp[n_x1] - d1
+
+    if method == "iterative":
+        F1 = 25000 # [N] - INITIAL GUESS
+        correction = 0
+        error = 100
+        itteration = 0
+        itteration_factor = 0.03 # 0.03 works very well
+        y0 = 0
+        a0 = 0
     
-    if info:    
+        # ITTERATION IN Y DIRECTION #
+        while abs(error) >= 10**-10: # [mm]
+            itteration += 1
+
+            F1 += correction
+            F3 = (F1*(x2-x1) + q*la*(la/2-x2))/(x3-x2)
+            F2 = F1 + F3 - q*la
+
+            # SHEAR, MOMENT, ANGLE AND DISPLACEMENT INTEGRATION #
+            with timer("Y_force.integration"):
+                shear, moment, angle, y_disp = integrate_beam(x_pos, q, [-F1, F2, -F3], [n_x1, n_x2, n_x3],
+                                                              EI=E*I1_zz, moment_sign=-1, y0=y0, a0=a0, rule=rule)
+
+            # DISPLACEMENT AND ANGLE ADJUSTMENT #
+            y_disp, angle = adjust_deflection(x_pos, y_disp, angle, n_x2, n_x3, x2, x3, d_b=d3)
+
+            correction = F1*(d1 - y_disp[n_x1])*itteration_factor
+            y0 = y_disp[0]
+            a0 = angle[0]
+            error = y_disp[n_x1] - d1
+
+            if not np.isfinite(error) or (itteration >= MAX_ITERATIONS and abs(error) >= 10**-10):
+                raise ConvergenceError("Forces in y direction not converged in " + str(itteration)
+                                       + " itterations, error: " + str(error) + " mm")
+
+        count("Y_force.iterations", itteration)
+
+    elif method == "direct":
+        F1, F2, F3 = Y_force_direct(cfg)
+        shear = q*x_pos - F1*macaulay(x_pos, x1, 0) + F2*macaulay(x_pos, x2, 0) - F3*macaulay(x_pos, x3, 0)
+        y_disp = Y_deflection(x_pos, cfg)
+        itteration = 0
+        error = 0.
+
+    else:
+        raise ValueError("Unknown solver method: " + str(method))
+
+    # --- Stations, deflection and convergence of the solution for the caller (mesh error estimates, benchmarks)
+    if solution is not None:
+        solution.update(x_pos=x_pos, disp=y_disp, iterations=itteration, error=error)
+
+    if info and method == "direct":
+        print("Calculated forces in y direction by direct solution")
+    elif info:
         print("Calculated forces in y direction in "+str(itteration)+" itterations, final error: "+str(error)+" mm")
         #print("F1y = "+str(F1)+" F2y = "+str(F2)+" F3y = "+str(F3))
     if plot:
-        par = shear
-        axis = [0]*len(x_pos)       
-        h = np.arange(min(par),max(par),(max(par)-min(par))/10)
-        h1x = [x1]*len(h)
-        h2x = [x2]*len(h)
-        h3x = [x3]*len(h)
-        h1a = [xa1]*len(h)
-        h2a = [xa2]*len(h)
-        
-        plt.figure()        
-        plt.plot(x_pos, par)
-        plt.plot(h1x, h, h2x, h, h3x, h, c="g")
-        plt.plot(h1a, h, h2a, h, c="y")
-        plt.plot(x_pos, axis, c="r")
-        plt.savefig("fig",dpi=1000)
-        plt.show()
+        # --- Exported on an Agg figure (non-blocking), plot can be the output file path
+        from src.tools_plot import plot_span_features
+        plot_span_features(x_pos, shear, [x1, x2, x3], [xa1, xa2], path=plot if isinstance(plot, str) else "fig.png")
     if ret:
         return([F1, 0, -F2, 0, F3])
         
     
 
-def Z_force(FY, n_steps=1000, plot=True, info=True, ret=False):
-    
+@profiled
+def Z_force(FY, n_steps=1000, plot=True, info=True, ret=False, method="iterative", cfg=None, x_pos=None,
+            solution=None):
+
+    # CONSTANTS #
+    cfg = get_config(cfg)
+    la, x1, x2, x3, xa, q, E = cfg.la, cfg.x1, cfg.x2, cfg.x3, cfg.xa, cfg.q, cfg.E
+    constants = solver_constants(cfg)
+    P, I1_yy, h_arm_a, h_arm_q = constants.P, constants.I1_yy, constants.h_arm_a, constants.h_arm_q
+
     # INITIATION #
-    dx = la/(n_steps)
-    x_pos = np.arange(0, la+1, dx)
-    n_x1 = int(n_steps*x1/la)+1
-    n_x2 = int(n_steps*x2/la)+1
-    n_x3 = int(n_steps*x3/la)+1
     xa1 = x2 - xa/2
     xa2 = x2 + xa/2
-    n_a1 = int(n_steps*xa1/la)+1
-    n_a2 = int(n_steps*xa2/la)+1
-    
-    F1 = 25000. # [N] - INITIAL GUESS
+    x_pos, (n_x1, n_a1, n_x2, n_a2, n_x3), rule = _stations(x_pos, n_steps, la, [x1, xa1, x2, xa2, x3])
     
-    error = 100
-    correction = 0
-    itteration = 0
-    itteration_factor = 1 # 0.35 works well
-    
-    z0 = 0
-    a0 = 0
-    
-    # ITTERATION IN Z DIRECTION #
-    while abs(error) >= 10**-10: # [mm]
-        itteration += 1
-        F1 += correction
-        
-        shear = [0]*len(x_pos)
-        moment = [0]*len(x_pos)
-        disp = [0]*len(x_pos)
-        angle = [0]*len(x_pos)
-        
-        disp[0] = z0
-        angle[0] = a0
-        
-        A = np.matrix([ [1,      1,      1         ],
-                        [0,      0,      h_arm_a     ],                   
-                        [(x2-x1), (x3-x1), (xa1-x1)] ])
-        
-        B = np.matrix([ [-P-F1],
-                        [-P*h_arm_a - q*la*h_arm_q],
-                        [-P*(xa2-x1)] ])
-        C = np.linalg.solve(A,B)
-        
-        
-        F2 = C[0,0]
-        F3 = C[1,0]
-        R = C[2,0]
-        
-        for i in range(1, n_steps+1):
-            
-            # SHEAR INTEGRATION #
-            shear[i] = shear[i-1]                
-            if i == n_x1:
-                shear[i] = shear[i] + F1
-            if i == n_a1:
-                shear[i] = shear[i] + R
-            if i == n_x2:
-                shear[i] = shear[i] + F2
-            if i == n_a2:
-                shear[i] = shear[i] + P
-            if i == n_x3:
-                shear[i] = shear[i] + F3
-                
-            # MOMENT INTEGRATION #    
-            moment[i] = moment[i-1] + shear[i]*dx
-            
-            # ANGLE INTEGRATION #
-            angle[i] = angle[i-1] + moment[i]*dx/(E*I1_yy)
-            
-            # DISPLACEMENT INTEGRATION #
-            disp[i] = disp[i-1] + angle[i]*dx
-        
-        # DISPLACEMENT AND ANGLE ADJUSTMENT #
-        x2_adjustment = - disp[n_x2]
-        x3_adjustment = - disp[n_x3] + disp[n_x2]
-        angle_adjustment = x3_adjustment/(x3-x2)
-        for i in range(0, n_steps+1):
-            disp[i] = disp[i] + x2_adjustment + x3_adjustment*(x_pos[i]-x2)/(x3-x2)
-            angle[i] = angle[i] + angle_adjustment
-        
-        correction = - F1*(disp[n_x1])*itteration_factor
-        z0 = disp[0]
-        a0 = angle[0]
-        error = disp[n_x1]
+    if method == "iterative":
+        F1 = 25000. # [N] - INITIAL GUESS
+
+        error = 100
+        correction = 0
+        itteration = 0
+        itteration_factor = 1 # 0.35 works well
+
+        z0 = 0
+        a0 = 0
 
-    if info:    
+        # ITTERATION IN Z DIRECTION #
+        while abs(error) >= 10**-10: # [mm]
+            itteration += 1
+            F1 += correction
+
+            A = np.array([[1,       1,       1],
+                          [0,       0,       h_arm_a],
+                          [(x2-x1), (x3-x1), (xa1-x1)]])
+
+            B = np.array([-P-F1,
+                          -P*h_arm_a - q*la*h_arm_q,
+                          -P*(xa2-x1)])
+            F2, F3, R = np.linalg.solve(A, B)
+
+            # SHEAR, MOMENT, ANGLE AND DISPLACEMENT INTEGRATION #
+            with timer("Z_force.integration"):
+                shear, moment, angle, disp = integrate_beam(x_pos, 0, [F1, R, F2, P, F3],
+                                                            [n_x1, n_a1, n_x2, n_a2, n_x3],
+                                                            EI=E*I1_yy, moment_sign=1, y0=z0, a0=a0, rule=rule)
+
+            # DISPLACEMENT AND ANGLE ADJUSTMENT #
+            disp, angle = adjust_deflection(x_pos, disp, angle, n_x2, n_x3, x2, x3)
+
+            correction = - F1*(disp[n_x1])*itteration_factor
+            z0 = disp[0]
+            a0 = angle[0]
+            error = disp[n_x1]
+
+            if not np.isfinite(error) or (itteration >= MAX_ITERATIONS and abs(error) >= 10**-10):
+                raise ConvergenceError("Forces in z direction not converged in " + str(itteration)
+                                       + " itterations, error: " + str(error) + " mm")
+
+        count("Z_force.iterations", itteration)
+
+    elif method == "direct":
+        F1, R, F2, F3, C1, C2 = Z_force_direct(cfg)
+        disp = Z_deflection(x_pos, cfg)
+        itteration = 0
+        error = 0.
+
+    else:
+        raise ValueError("Unknown solver method: " + str(method))
+
+    # --- Stations, deflection and convergence of the solution for the caller (mesh error estimates, benchmarks)
+    if solution is not None:
+        solution.update(x_pos=x_pos, disp=disp, iterations=itteration, error=error)
+
+    if info and method == "direct":
+        print("Calculated forces in z direction by direct solution")
+    elif info:
         print("Calculated forces in z direction in "+str(itteration)+" itterations, final error: "+str(error)+" mm")
         #print("F1z = "+str(F1)+" R = "+str(R)+" F2z = "+str(F2)+" P = "+str(P)+" F3z = "+str(F3))  
     if plot:
-        par = disp
-        axis = [0]*len(x_pos)
-        h = np.arange(min(par),max(par),(max(par)-min(par))/10) 
-        h1x = [x1]*len(h)
-        h2x = [x2]*len(h)
-        h3x = [x3]*len(h)
-        h1a = [xa1]*len(h)
-        h2a = [xa2]*len(h)
-        
-        plt.figure()        
-        plt.plot(x_pos, par)
-        plt.plot(h1x, h, h2x, h, h3x, h, c="g")
-        plt.plot(h1a, h, h2a, h, c="y")
-        plt.plot(x_pos, axis, c="r")
-        plt.savefig("fig",dpi=1000)
-        plt.show()
+        # --- Exported on an Agg figure (non-blocking), plot can be the output file path
+        from src.tools_plot import plot_span_features
+        plot_span_features(x_pos, disp, [x1, x2, x3], [xa1, xa2], path=plot if isinstance(plot, str) else "fig.png")
     if ret:
         return([F1, R, F2, P, F3])
 
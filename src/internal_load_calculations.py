@@ -0,0 +1,53 @@
+import numpy as np
+
+from src.tools_profiling import profiled
+
+
+@profiled
+def internal_load_calc(x_pos, feature_x, feature_y_load, feature_z_load, q):
+    """
+    Calculate the internal shear forces and bending moments at every station of the span in one pass.
+
+    Shear forces are the cumulative sum of the distributed load and of the point loads applied at the
+    feature stations, bending moments the sum of the Heaviside-masked lever arms of every point load
+    and of the distributed load.
+
+    :param x_pos: Sorted station x locations
+    :param feature_x: x locations of the features (ribs and hinged slice)
+    :param feature_y_load: y loads applied at the features
+    :param feature_z_load: z loads applied at the features
+    :param q: Distributed aerodynamic load (N/mm)
+    :return: y internal load, z internal load, y internal moment, z internal moment (arrays over the stations)
+    """
+    x_pos = np.asarray(x_pos, dtype=float)
+    feature_x = np.asarray(feature_x, dtype=float)
+    feature_y_load = np.asarray(feature_y_load, dtype=float)
+    feature_z_load = np.asarray(feature_z_load, dtype=float)
+
+    # --- Point loads applied at the first station located at each feature
+    feature_station = np.searchsorted(x_pos, feature_x, side="left")
+    y_point_loads = np.zeros(len(x_pos))
+    z_point_loads = np.zeros(len(x_pos))
+    np.add.at(y_point_loads, feature_station, feature_y_load)
+    np.add.at(z_point_loads, feature_station, feature_z_load)
+
+    # --- Shear: loads at the first station are not carried (free end)
+    y_point_loads[0] = 0
+    z_point_loads[0] = 0
+
+    y_internal_load = q*(x_pos - x_pos[0]) - np.cumsum(y_point_loads)
+    z_internal_load = -np.cumsum(z_point_loads)
+
+    # --- Moments: every point load acts past its feature only
+    y_internal_moment = q*x_pos*(x_pos/2)
+    z_internal_moment = np.zeros(len(x_pos))
+
+    for k in range(len(feature_x)):
+        arm = np.where(x_pos > feature_x[k], x_pos - feature_x[k], 0)
+        y_internal_moment -= feature_y_load[k]*arm
+        z_internal_moment -= feature_z_load[k]*arm
+
+    y_internal_moment[0] = 0
+    z_internal_moment[0] = 0
+
+    return y_internal_load, z_internal_load, y_internal_moment, z_internal_moment
@@ -1,24 +1,37 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from src.class_SLICE import Slice
+from src.class_CROSS_SECTION import get_cross_section
+from src.class_CONFIG import get_config
+from src.tools_integration import cumulative_integral
+from src.tools_profiling import profiled
 #get_ipython().run_line_magic('matplotlib','qt')
 
-from src.tools_plot import *
 
-from config import *
 
+@profiled
+def moment_calc(FY, FZ, x_pos, feature_lst, cfg=None):
+    """
+    Integrate the torque and the angle of twist along the span.
 
-def moment_calc(FY, FZ, x_pos, feature_lst):
+    :param FY: Reaction forces in y direction at the features
+    :param FZ: Reaction forces in z direction at the features
+    :param x_pos: Separations between consecutive stations
+    :param feature_lst: Station index of each feature
+    :param cfg: AileronConfig (current values in config.py by default)
+    :return: torque and twist (deg) arrays at every station (len(x_pos)+1), the torque is zero at the first station
+             and the twist equals theta at the first actuator (feature 1)
+    """
+    cfg = get_config(cfg)
 
     # INITIATION #
-    n_list = feature_lst
-    n_steps = len(x_pos)
+    n_list = np.asarray(feature_lst, dtype=np.intp)
+    dx = np.asarray(x_pos, dtype=float)
+    n_steps = len(dx) + 1
 
     # CONSTANTS #
-    cross_section = Slice()
+    cross_section = get_cross_section(cfg)
 
-    theta_max = theta*np.pi/180     # [rad]
-    hinge = ha/2
+    theta_max = cfg.theta*np.pi/180     # [rad]
+    hinge = cfg.ha/2
     act = hinge*np.sqrt(2)
 
     I1_zz = cross_section.I_yy    # [mm**4]
@@ -27,34 +40,27 @@ def moment_calc(FY, FZ, x_pos, feature_lst):
     sc = cross_section.shear_center_u # [mm] shear center distance from LE
 
     arm_a = act*np.sin(np.pi/4-theta_max)-(sc - hinge)*np.sin(theta_max)
-    arm_q = (ca/4-sc)*np.cos(theta_max)
+    arm_q = (cfg.ca/4-sc)*np.cos(theta_max)
     arm_y = (sc-hinge)*np.cos(theta_max)
     arm_z = (sc-hinge)*np.sin(theta_max)
 
     n_a1 = n_list[1]
 
-    theta_lst = [0]*len(x_pos)
-    torque = [0]*len(x_pos)
+    # POINT TORQUES AT THE FEATURES (ACTUATORS AT FEATURES 1 AND 3) #
+    feature_torque = np.asarray(FY, dtype=float)*arm_y - np.asarray(FZ, dtype=float)*arm_z
+    feature_torque[[1, 3]] = np.asarray(FZ, dtype=float)[[1, 3]]*arm_a
 
-    for i in range(1, n_steps):
-        dx = x_pos[i-1]
+    in_span = (n_list >= 1) & (n_list < n_steps)
+    point_torque = np.zeros(n_steps)
+    np.add.at(point_torque, n_list[in_span], feature_torque[in_span])
 
-        # INTEGRATE MOMENTS TO GET TORQUES#
-        torque[i] = torque[i-1] + q*arm_q*dx
+    # INTEGRATE MOMENTS TO GET TORQUES #
+    torque = cumulative_integral(np.full(n_steps, cfg.q*arm_q), dx) + np.cumsum(point_torque)
 
-        if n_list.count(i) == 1:
-            if n_list.index(i) == 1 or n_list.index(i) == 3:
-                torque[i] = torque[i] + FZ[n_list.index(i)]*arm_a
-            else:
-                torque[i] = torque[i] + FY[n_list.index(i)]*arm_y - FZ[n_list.index(i)]*arm_z
-
-        # INTEGRATE TORQUES TO GET THETA #
-        theta_lst[i] = theta_lst[i-1] - torque[i]*dx/(G*J)
+    # INTEGRATE TORQUES TO GET THETA #
+    theta_lst = cumulative_integral(-torque/(cfg.G*J), dx)
 
     theta_adjustment = theta_lst[n_a1] + theta_max
-    theta_deg = theta_lst
-    for i in range(0, n_steps):
-        theta_lst[i] = theta_lst[i] - theta_adjustment
-        theta_deg[i] = -theta_lst[i]*180/np.pi
+    theta_deg = -(theta_lst - theta_adjustment)*180/np.pi
 
     return torque, theta_deg
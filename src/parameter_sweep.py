@@ -0,0 +1,124 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from src.analysis import run_analysis
+from src.class_CONFIG import get_config
+from src.tools_results import SPAN_FIELDS, create_store, append_results
+
+
+def parameter_grid(**values):
+    """
+    Build the full factorial list of parameter sets, e.g. parameter_grid(tsk=[1.1, 1.2], theta=[20, 28])
+
+    :return: List of dictionaries, one per design point
+    """
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*values.values())]
+
+
+def summarise(results):
+    """
+    Reduce the results of run_analysis to one row of scalar values.
+    """
+    FY = results["FY"]
+    FZ = results["FZ"]
+
+    row = {"F1y": FY[0], "F2y": FY[2], "F3y": FY[4],
+           "F1z": FZ[0], "R": FZ[1], "F2z": FZ[2], "F3z": FZ[4]}
+
+    for name in ["y_internal_load", "z_internal_load", "y_internal_moment", "z_internal_moment", "x_torque"]:
+        row["max_" + name] = np.max(np.abs(results[name]))
+
+    for name in ["max_panel_shear_flow", "max_direct_stress", "min_direct_stress", "max_von_mises"]:
+        row[name] = results[name]
+
+    for name in ["le_y", "le_z", "te_y", "te_z"]:
+        row["max_" + name + "_deflection"] = np.max(np.abs(results["deflection_" + name]))
+
+    row["max_twist"] = np.max(results["displacement_theta"])
+    row["min_twist"] = np.min(results["displacement_theta"])
+
+    for label, q1, q2 in zip(results["rib_labels"], results["rib_q1"], results["rib_q2"]):
+        row["q1_" + str(label)] = q1
+        row["q2_" + str(label)] = q2
+
+    return row
+
+
+def run_design_point(cfg, nb_of_slices=None, n_steps=10000, method="direct", cache=True):
+    """
+    Run the analysis of one configuration and return its summary row.
+    """
+    return summarise(run_analysis(cfg, nb_of_slices=nb_of_slices, n_steps=n_steps, method=method, cache=cache))
+
+
+def _run_design_point_fields(cfg, nb_of_slices=None, n_steps=10000, method="direct", cache=True):
+    # --- Summary row and station distributions, for the result store of run_sweep
+    results = run_analysis(cfg, nb_of_slices=nb_of_slices, n_steps=n_steps, method=method, cache=cache)
+    return summarise(results), {name: results[name] for name in ["x_location"] + SPAN_FIELDS}
+
+
+def run_sweep(parameter_sets, base_config=None, max_workers=None, nb_of_slices=None, n_steps=10000, method="direct",
+              cache=True, store=None):
+    """
+    Run the analysis over a list of parameter sets, spread over a pool of worker processes.
+
+    :param parameter_sets: List of dictionaries of design variables (see parameter_grid), all with the same names
+    :param base_config: AileronConfig the parameter sets are applied to (current values in config.py by default)
+    :param max_workers: Number of worker processes (number of cores by default, 1 runs in this process)
+    :param nb_of_slices: Number of simple slices of the span discretisation (configuration value by default)
+    :param n_steps: Number of integration steps of the iterative force solvers
+    :param method: Force solver method ("direct" or "iterative")
+    :param cache: Reuse the reaction forces of design points solved before (on-disk result cache)
+    :param store: Result store file receiving the station distributions of every design point, in the order of
+                  parameter_sets (see tools_results), None to only keep the summary
+    :return: Structured array with one row per parameter set: the parameters followed by the summary values
+    """
+    parameter_sets = list(parameter_sets)
+    if not parameter_sets:
+        raise ValueError("No parameter sets to run")
+
+    names = list(parameter_sets[0])
+    for parameters in parameter_sets:
+        if list(parameters) != names:
+            raise ValueError("All parameter sets must define the same design variables")
+
+    base_config = get_config(base_config)
+    configs = [base_config.replace(**parameters) for parameters in parameter_sets]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    run = partial(run_design_point if store is None else _run_design_point_fields,
+                  nb_of_slices=nb_of_slices, n_steps=n_steps, method=method, cache=cache)
+
+    if max_workers == 1:
+        rows = [run(cfg) for cfg in configs]
+    else:
+        chunksize = max(1, len(configs)//(4*max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(run, configs, chunksize=chunksize))
+
+    # --- Station distributions into the result store, in the order of the parameter sets
+    if store is not None:
+        create_store(store, rows[0][1]["x_location"])
+        for cfg, (_, fields) in zip(configs, rows):
+            append_results(store, fields, cfg)
+        rows = [row for row, _ in rows]
+
+    # --- Tidy results table
+    parameter_dtype = [(name, np.int64 if isinstance(parameter_sets[0][name], (int, np.integer)) else np.float64)
+                       for name in names]
+    table = np.zeros(len(rows), dtype=parameter_dtype + [(name, np.float64) for name in rows[0]])
+
+    for i, (parameters, row) in enumerate(zip(parameter_sets, rows)):
+        for name in names:
+            table[name][i] = parameters[name]
+        for name, value in row.items():
+            table[name][i] = value
+
+    return table
@@ -0,0 +1,175 @@
+import numpy as np
+from collections import namedtuple
+
+from src.stress_calculations import direct_stress_field
+from src.tools_profiling import profiled
+
+# CONSTANTS #
+Panel_properties = namedtuple("Panel_properties", ["open_incidence", "length", "thickness", "delta_y", "moment_arm",
+                                                   "twist", "closure", "A", "A_inv", "closure_moment", "closure_open",
+                                                   "open_sy", "open_sz", "unit_sy", "unit_sz", "unit_tx"])
+
+
+def section_loads(y_internal_load, z_internal_load, y_internal_moment, z_internal_moment, theta):
+    """
+    Rotate internal loads into the cross-section axes (vectorised over any number of load cases).
+
+    :param theta: Aileron angle (degrees)
+    :return: Sy, Sz, My, Mz arrays
+    """
+    theta = np.radians(theta)
+
+    Sy = np.multiply(y_internal_load, np.cos(theta)) - np.multiply(z_internal_load, np.sin(theta))
+    Sz = np.multiply(z_internal_load, np.cos(theta)) + np.multiply(y_internal_load, np.sin(theta))
+
+    My = np.multiply(y_internal_moment, np.cos(theta)) - np.multiply(z_internal_moment, np.sin(theta))
+    Mz = np.multiply(z_internal_moment, np.cos(theta)) + np.multiply(y_internal_moment, np.sin(theta))
+
+    return Sy, Sz, My, Mz
+
+
+def calc_panel_properties(cross_section):
+    """
+    Calculate the panel constants of a cross-section from its panel connectivity graph (see
+    Cross_section.construct_panels). Called once by Cross_section, which stores the result as its panel_properties
+    attribute:
+
+    - open_incidence, length, thickness, delta_y, moment_arm, twist, closure: panel graph arrays of the cross-section
+    - A, A_inv: closure system matrix (moment equilibrium and rate of twist compatibility) and its inverse
+    - closure_moment (2): q_s01, q_s02 per unit external moment around the bottom spar boom
+    - closure_open (panels x 2): q_s01, q_s02 per unit open section shear flow of every panel
+    - open_sy, open_sz: open section shear flow of every panel per unit Sy and Sz, with the load independent
+      boom areas of the cross-section
+    - unit_sy, unit_sz, unit_tx: closed section shear flow of every panel per unit Sy, Sz and Tx (same boom areas)
+
+    :param cross_section: Cross_section instance
+    :return: Panel_properties named tuple
+    """
+    cs = cross_section
+    y_pos = np.array(cs.booms_y_positions)
+    z_pos = np.array(cs.booms_z_positions)
+    z_spar = z_pos[cs.spar_bottom]
+
+    A1 = 1.0/4.0*np.pi*cs.ha*cs.ha*0.5
+    A2 = 0.5*cs.ha*(cs.ca - 0.5*cs.ha)
+    A = np.array([[-2.0*A1, -2.0*A2], cs.panel_twist @ cs.panel_closure])
+
+    # --- The closure only depends on the geometry, so the closure shear flows are linear combinations of the
+    # --- external moment and of the open section shear flows
+    A_inv = np.linalg.inv(A)
+    closure_moment = A_inv[:, 0]
+    closure_open = -np.column_stack([cs.panel_moment_arm, cs.panel_twist]) @ A_inv.T
+
+    # --- Open section shear flows per unit shear force, load independent boom areas
+    open_sy = cs.open_incidence @ (-cs.boom_areas*y_pos/cs.I_u)
+    open_sz = cs.open_incidence @ (-cs.boom_areas*(z_pos - cs.u_centroid)/cs.I_v)
+
+    # --- Unit load solutions, external moments of unit Sy, Sz and Tx around the bottom spar boom
+    closure = cs.panel_closure
+    unit_sy = open_sy + closure @ (closure_moment*(cs.shear_center_u - z_spar) + open_sy @ closure_open)
+    unit_sz = open_sz + closure @ (closure_moment*(-0.5*cs.ha) + open_sz @ closure_open)
+    unit_tx = closure @ (closure_moment*(-1.))
+
+    return Panel_properties(cs.open_incidence, cs.panel_length, cs.panel_thickness, cs.panel_delta_y,
+                            cs.panel_moment_arm, cs.panel_twist, closure, A, A_inv, closure_moment, closure_open,
+                            open_sy, open_sz, unit_sy, unit_sz, unit_tx)
+
+
+def panel_properties(cross_section):
+    """
+    Return the panel constants of a cross-section (see calc_panel_properties), computed once when the
+    cross-section is built.
+    """
+    return cross_section.panel_properties
+
+
+def _close_shear_flows(cross_section, properties, q_open, Sy, Sz, Tx):
+    """
+    Add the closure shear flows of all load cases to their open section shear flows (load cases x panels), using
+    the precomputed closure influence coefficients instead of solving the closure system.
+
+    :return: q_s01, q_s02 (load cases) and the panel shear flows (load cases x panels)
+    """
+    z_spar = cross_section.booms_z_positions[cross_section.spar_bottom]
+    M = -Sz*0.5*cross_section.ha + Sy*(cross_section.shear_center_u - z_spar) - Tx
+
+    q_s0 = np.outer(M, properties.closure_moment) + q_open @ properties.closure_open
+
+    return q_s0[:, 0], q_s0[:, 1], q_open + q_s0 @ properties.closure.T
+
+
+@profiled
+def shear_flow_calc(cross_section, Sy, Sz, My, Mz, Tx):
+    """
+    Calculate the rib and shear center closure shear flows of any number of load cases at once.
+
+    The boom areas are idealised from the direct stress distribution of every load case, the open section
+    shear flows follow from the panel incidence matrix, and the closure shear flows (rate of twist compatibility and
+    moment equilibrium) from the closure influence coefficients of the cross-section.
+
+    :param cross_section: Cross_section instance
+    :param Sy, Sz: Shear forces in the cross-section axes (arrays over the load cases, or scalars)
+    :param My, Mz: Bending moments in the cross-section axes
+    :param Tx: Torque
+    :return: q1, q2 (rib shear flows left and right of the spar) and q_s01, q_s02 (closure shear flows of
+             the curved and triangular cells), with the broadcast shape of the loads (scalars for scalar loads)
+    """
+    cs = cross_section
+    properties = panel_properties(cs)
+
+    Sy, Sz, My, Mz, Tx = np.broadcast_arrays(*[np.asarray(load, dtype=float) for load in (Sy, Sz, My, Mz, Tx)])
+    shape = Sy.shape
+    Sy, Sz, My, Mz, Tx = [load.ravel() for load in (Sy, Sz, My, Mz, Tx)]
+
+    y_pos = np.array(cs.booms_y_positions)
+    z_arm = np.array(cs.booms_z_positions) - cs.u_centroid
+
+    # --- Direct stresses and boom areas (load cases x booms)
+    Nstress = direct_stress_field(cs, My, Mz)
+    boomarea = np.sum(cs.boom_weights*(2.0 + Nstress[:, cs.boom_neighbours]/Nstress[:, :, None]), axis=2) \
+        + cs.boom_stringer_area
+
+    # --- Open section shear flows (load cases x panels)
+    dq = -boomarea*np.outer(Sy/cs.I_u, y_pos) - boomarea*np.outer(Sz/cs.I_v, z_arm)
+    q_open = dq @ properties.open_incidence.T
+
+    q_s01, q_s02, q_panel = _close_shear_flows(cs, properties, q_open, Sy, Sz, Tx)
+
+    # --- Rib shear flow slightly left of the spar, compensating the vertical components of the skin shear flows
+    curved = cs.panel_cell == "Curved"
+    q1 = q_panel[:, curved] @ properties.delta_y[curved]/cs.ha
+
+    # --- Rib shear flow slightly right of the spar
+    triangular = cs.panel_cell == "Triangular"
+    A2 = 0.5*cs.ha*(cs.ca - 0.5*cs.ha)
+
+    P13z = (2.0*q_s02*A2 + q_open[:, triangular] @ properties.moment_arm[triangular])/cs.ha
+    P13y = P13z*np.tan(cs.angle_tail)
+
+    q2 = (-q_s02*cs.ha + q_open[:, triangular] @ properties.delta_y[triangular] - P13y)/cs.ha
+
+    return q1.reshape(shape)[()], q2.reshape(shape)[()], q_s01.reshape(shape)[()], q_s02.reshape(shape)[()]
+
+
+@profiled
+def shear_flow_field(cross_section, Sy, Sz, Tx):
+    """
+    Calculate the shear flow in every panel of the cross-section for any number of stations at once.
+
+    With the load independent boom areas of the cross-section, the shear flows are linear in Sy, Sz and Tx, so every
+    station is a combination of the unit load solutions computed once per cross-section (see panel_properties).
+
+    This is an approximation of shear_flow_calc, which idealises the boom areas from the direct stress of every load
+    case: at the ribs of config.py, the rib shear flows derived from the field differ by about 0.4% of the largest
+    rib shear flow.
+
+    :param cross_section: Cross_section instance
+    :param Sy, Sz: Shear forces in the cross-section axes (arrays over the stations)
+    :param Tx: Torque (array over the stations)
+    :return: Array of panel shear flows (stations x panels, panels ordered as in cross_section.panels)
+    """
+    properties = panel_properties(cross_section)
+
+    Sy, Sz, Tx = np.broadcast_arrays(*[np.atleast_1d(np.asarray(load, dtype=float)) for load in (Sy, Sz, Tx)])
+
+    return np.outer(Sy, properties.unit_sy) + np.outer(Sz, properties.unit_sz) + np.outer(Tx, properties.unit_tx)
@@ -0,0 +1,44 @@
+import numpy as np
+from collections import namedtuple
+
+from src.tools_profiling import profiled
+
+Stress_peak = namedtuple("Stress_peak", ["value", "station", "x_location", "boom"])
+
+
+@profiled
+def direct_stress_field(cross_section, My, Mz):
+    """
+    Calculate the direct (bending) stress sigma_xx in every boom for any number of stations at once.
+
+    sigma_xx = Mz/I_u*y + My/I_v*(z - u_centroid), evaluated as one outer product per moment.
+
+    :param cross_section: Cross_section instance
+    :param My, Mz: Bending moments in the cross-section axes (arrays over the stations, see section_loads)
+    :return: Array of direct stresses (stations x booms, booms ordered as in the cross-section)
+    """
+    y_pos = np.array(cross_section.booms_y_positions)
+    z_arm = np.array(cross_section.booms_z_positions) - cross_section.u_centroid
+
+    My, Mz = np.broadcast_arrays(np.atleast_1d(np.asarray(My, dtype=float)), np.atleast_1d(np.asarray(Mz, dtype=float)))
+
+    return np.outer(Mz/cross_section.I_u, y_pos) + np.outer(My/cross_section.I_v, z_arm)
+
+
+def stress_peaks(field, x_pos=None):
+    """
+    Find the maximum and minimum of a (stations x booms or panels) field and where they occur.
+
+    :param field: Array of stresses or shear flows (stations x booms)
+    :param x_pos: Station x locations (optional)
+    :return: Maximum and minimum Stress_peak (value, station index, station x location, boom index)
+    """
+    field = np.asarray(field)
+    peaks = []
+
+    for flat_index in (np.argmax(field), np.argmin(field)):
+        station, boom = np.unravel_index(flat_index, field.shape)
+        x_location = None if x_pos is None else x_pos[station]
+        peaks.append(Stress_peak(field[station, boom], station, x_location, boom))
+
+    return peaks[0], peaks[1]
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+# CONSTANTS #
+CACHE_DIR = os.environ.get("SVV_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                                         ".svv_cache"))
+CACHE_SIZE_LIMIT = 64*1024**2    # [bytes]
+
+
+def cache_key(*parts):
+    """
+    Hash the parts (configuration, mesh size, solver version, ...) into a content address.
+
+    The parts are hashed through their repr, which is exact for the floats, ints, strings and
+    AileronConfig instances the solvers are called with.
+
+    :return: Hexadecimal SHA-256 digest
+    """
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, key + ".npz")
+
+
+def cache_load(key, cache_dir=None):
+    """
+    Load the arrays stored under key.
+
+    :return: Dictionary of NumPy arrays, None if the entry does not exist
+    """
+    path = _entry_path(key, cache_dir or CACHE_DIR)
+
+    try:
+        with np.load(path) as entry:
+            arrays = {name: entry[name] for name in entry.files}
+    except (OSError, ValueError):
+        return None
+
+    # --- Mark the entry as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    return arrays
+
+
+def cache_store(key, arrays, cache_dir=None, size_limit=CACHE_SIZE_LIMIT):
+    """
+    Store a dictionary of arrays under key, then evict the least recently used entries above the size limit.
+
+    The entry is written to a temporary file and renamed, so concurrent sweep workers never read partial files.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+
+    fd, temporary_path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(temporary_path, _entry_path(key, cache_dir))
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+    cache_evict(cache_dir, size_limit)
+
+
+def cache_evict(cache_dir=None, size_limit=CACHE_SIZE_LIMIT):
+    """
+    Remove the least recently used entries until the cache directory fits in size_limit bytes.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".npz"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= size_limit:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+
+def cache_clear(cache_dir=None):
+    cache_evict(cache_dir, size_limit=-1)
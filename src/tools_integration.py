@@ -0,0 +1,91 @@
+import numpy as np
+
+
+def cumulative_integral(values, dx, initial=0., rule="rectangle"):
+    """
+    Integrate values along the stations with the rectangle rule used throughout the solvers:
+    result[0] = initial, result[i] = result[i-1] + values[i]*dx[i-1]
+    or with the trapezoidal rule (second order accurate on non-uniform stations):
+    result[0] = initial, result[i] = result[i-1] + (values[i-1] + values[i])*dx[i-1]/2
+
+    :param values: Array of values at the stations (n)
+    :param dx: Array of station separations (n-1), non-uniform separations are allowed
+    :param initial: Value of the integral at the first station
+    :param rule: Integration rule ("rectangle" or "trapezoid")
+    :return: Array of integrated values (n)
+    """
+    values = np.asarray(values, dtype=float)
+
+    if rule == "rectangle":
+        increments = values[1:]*dx
+    elif rule == "trapezoid":
+        increments = 0.5*(values[:-1] + values[1:])*dx
+    else:
+        raise ValueError("Unknown integration rule: " + str(rule))
+
+    result = np.empty(len(values))
+    result[0] = initial
+    np.cumsum(increments, out=result[1:])
+    result[1:] += initial
+    return result
+
+
+def integrate_beam(x_pos, distributed_load=0., point_loads=(), point_index=(), EI=1., moment_sign=-1, y0=0., a0=0.,
+                   rule="rectangle"):
+    """
+    Integrate a beam load distribution into shear, moment, slope and deflection at every station.
+
+    shear[i] = shear[i-1] + w[i]*dx + point loads applied at station i
+    moment[i] = moment[i-1] + moment_sign*shear[i]*dx
+    angle[i] = angle[i-1] + moment[i]*dx/EI
+    disp[i] = disp[i-1] + angle[i]*dx
+
+    The trapezoidal rule integrates the moment, slope and deflection to second order, so it converges much faster
+    on the graded stations of tools_mesh.adaptive_mesh, where a station sits on every point load.
+
+    :param x_pos: Sorted station x locations (uniform or not)
+    :param distributed_load: Distributed load w, scalar or array over the stations
+    :param point_loads: Point loads
+    :param point_index: Station index at which each point load is applied (must be > 0)
+    :param EI: Bending stiffness
+    :param moment_sign: Sign convention between shear and moment (-1 for y, 1 for z)
+    :param y0: Deflection at the first station
+    :param a0: Slope at the first station
+    :param rule: Integration rule ("rectangle" or "trapezoid", see cumulative_integral)
+    :return: shear, moment, angle, disp arrays
+    """
+    x_pos = np.asarray(x_pos, dtype=float)
+    dx = np.diff(x_pos)
+
+    load = np.zeros(len(x_pos))
+    load += distributed_load
+    load[1:] *= dx
+    load[0] = 0.
+    np.add.at(load, np.asarray(point_index, dtype=np.intp), np.asarray(point_loads, dtype=float))
+
+    # --- load[i] holds the shear increment between station i-1 and station i
+    shear = np.cumsum(load)
+    moment = cumulative_integral(moment_sign*shear, dx, rule=rule)
+    angle = cumulative_integral(moment/EI, dx, a0, rule)
+    disp = cumulative_integral(angle, dx, y0, rule)
+
+    return shear, moment, angle, disp
+
+
+def adjust_deflection(x_pos, disp, angle, n_a, n_b, x_a, x_b, d_a=0., d_b=0.):
+    """
+    Superpose a rigid body motion on the deflection so that it matches the prescribed
+    deflections d_a at station n_a and d_b at station n_b (support locations x_a and x_b).
+
+    :return: Adjusted disp and angle arrays
+    """
+    x_pos = np.asarray(x_pos, dtype=float)
+
+    a_adjustment = d_a - disp[n_a]
+    b_adjustment = d_b - disp[n_b] - a_adjustment
+    angle_adjustment = b_adjustment/(x_b-x_a)
+
+    disp = disp + a_adjustment + b_adjustment*(x_pos-x_a)/(x_b-x_a)
+    angle = angle + angle_adjustment
+
+    return disp, angle
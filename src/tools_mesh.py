@@ -0,0 +1,122 @@
+import numpy as np
+from collections import namedtuple
+
+import src.force_calculations_v2 as fc
+from src.class_CONFIG import get_config
+
+# CONSTANTS #
+Tip_deflection = namedtuple("Tip_deflection", ["y", "z", "y_error", "z_error", "n_stations"])
+
+
+def feature_locations(cfg=None):
+    """
+    Return the x locations of the point loads along the span: hinges 1-3 and actuators I and II.
+
+    :param cfg: AileronConfig (current values in config.py by default)
+    :return: Sorted array [x1, x2 - xa/2, x2, x2 + xa/2, x3]
+    """
+    cfg = get_config(cfg)
+    return np.array([cfg.x1, cfg.x2 - cfg.xa/2, cfg.x2, cfg.x2 + cfg.xa/2, cfg.x3])
+
+
+def _graded_offsets(length, h_min, h_max, growth):
+    """
+    Offsets from 0 to length of stations whose separation grows from h_min at 0 up to h_max.
+
+    The number of stations follows from integrating the station density 1/h(d), with h(d) = min(h_min +
+    (growth - 1)*d, h_max), and the offsets from its inverse, so the separations never exceed h(d).
+    """
+    d_c = (h_max - h_min)/(growth - 1)          # offset where the separation reaches h_max
+    N_c = np.log(h_max/h_min)/(growth - 1)      # number of stations up to d_c
+
+    if length <= d_c:
+        N_total = np.log1p((growth - 1)*length/h_min)/(growth - 1)
+    else:
+        N_total = N_c + (length - d_c)/h_max
+
+    N = np.linspace(0, N_total, max(1, int(np.ceil(N_total))) + 1)
+    offsets = np.where(N < N_c, h_min*np.expm1((growth - 1)*np.minimum(N, N_c))/(growth - 1), d_c + (N - N_c)*h_max)
+    offsets[-1] = length
+
+    return offsets
+
+
+def adaptive_mesh(cfg=None, h_min=1e-3, h_max=20., growth=1.5):
+    """
+    Generate span stations clustered around the point loads (see feature_locations) and coarsened elsewhere.
+
+    Every point load gets a station, the separation grows from h_min next to the point loads up to h_max
+    between them. The root and tip carry no point load and are not refined. With the trapezoidal rule of the
+    iterative solvers, the tip deflection error scales with h_min and h_max**2 (see tip_deflection_error):
+    the default mesh of about 300 stations is more accurate than the uniform grid of 10000 steps.
+
+    :param cfg: AileronConfig (current values in config.py by default)
+    :param h_min: Station separation next to the point loads (mm)
+    :param h_max: Largest station separation (mm)
+    :param growth: Separation growth (> 1), the separation at a distance d from the nearest point load is at most
+                   h_min + (growth - 1)*d
+    :return: Sorted array of station x locations from 0 to la
+    """
+    cfg = get_config(cfg)
+
+    if not 0 < h_min <= h_max:
+        raise ValueError("The station separations must satisfy 0 < h_min <= h_max")
+    if growth <= 1:
+        raise ValueError("The separation growth factor must be larger than 1")
+
+    features = feature_locations(cfg)
+    stations = [features]
+
+    # --- Root and tip intervals, graded from the first and last point load only
+    stations.append(features[0] - _graded_offsets(features[0], h_min, h_max, growth))
+    stations.append(features[-1] + _graded_offsets(cfg.la - features[-1], h_min, h_max, growth))
+
+    # --- Intervals between point loads, graded from both ends to the middle
+    for a, b in zip(features[:-1], features[1:]):
+        offsets = _graded_offsets(0.5*(b - a), h_min, h_max, growth)
+        stations.append(a + offsets)
+        stations.append(b - offsets)
+
+    return np.unique(np.concatenate(stations))
+
+
+def refine_mesh(x_pos):
+    """
+    Halve every station separation by inserting the midpoints.
+    """
+    x_pos = np.asarray(x_pos, dtype=float)
+
+    refined = np.empty(2*len(x_pos) - 1)
+    refined[::2] = x_pos
+    refined[1::2] = 0.5*(x_pos[:-1] + x_pos[1:])
+    return refined
+
+
+def _tip_deflection(x_pos, cfg):
+    y_solution = {}
+    z_solution = {}
+    FY = fc.Y_force(plot=False, info=False, ret=True, method="iterative", cfg=cfg, x_pos=x_pos, solution=y_solution)
+    fc.Z_force(FY, plot=False, info=False, ret=True, method="iterative", cfg=cfg, x_pos=x_pos, solution=z_solution)
+
+    return y_solution["disp"][-1], z_solution["disp"][-1]
+
+
+def tip_deflection_error(x_pos=None, cfg=None):
+    """
+    Solve the hinge line deflection at the tip (x = la) with the iterative solvers on the stations x_pos, and
+    estimate its discretisation error from the difference with the solution on the refined stations
+    (see refine_mesh).
+
+    :param x_pos: Sorted station x locations from 0 to la (adaptive_mesh(cfg) by default)
+    :param cfg: AileronConfig (current values in config.py by default)
+    :return: Tip_deflection named tuple (y, z tip deflections in mm, their error estimates and number of stations)
+    """
+    cfg = get_config(cfg)
+    if x_pos is None:
+        x_pos = adaptive_mesh(cfg)
+    x_pos = np.asarray(x_pos, dtype=float)
+
+    y_tip, z_tip = _tip_deflection(x_pos, cfg)
+    y_refined, z_refined = _tip_deflection(refine_mesh(x_pos), cfg)
+
+    return Tip_deflection(y_tip, z_tip, abs(y_refined - y_tip), abs(z_refined - z_tip), len(x_pos))
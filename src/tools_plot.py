@@ -1,7 +1,35 @@
-import matplotlib.pyplot as plt
-from src.class_SLICE import *
+"""
+Plotting of the analysis results, kept out of the solver imports: matplotlib is only imported when a plot is made.
+
+The interactive functions (plot_internal_forces, plot_3d_aileron, plot_le_te_deflection) open pyplot windows.
+The export functions (plot_span_features, export_span_plots) draw on Agg figures, independent of pyplot and of any
+GUI backend, and write them to files without blocking.
+"""
+import os
+
+import numpy as np
+
+# CONSTANTS #
+DPI = 150    # default resolution of the exported plots [dots per inch]
+
+# --- Span distributions of run_analysis exported by export_span_plots: (file name, title, y label, result names)
+SPAN_PLOTS = [("internal_loads", "Internal loads over the aileron span", "Internal load (N)",
+               ["y_internal_load", "z_internal_load"]),
+              ("internal_moments", "Internal moments over the aileron span", "Internal moment (N mm)",
+               ["y_internal_moment", "z_internal_moment"]),
+              ("torque", "Torque over the aileron span", "Torque (N mm)", ["x_torque"]),
+              ("twist", "Aileron angle over the span", "Angle (deg)", ["displacement_theta"]),
+              ("deflection_y", "Deflection in y direction over the aileron span", "Deflection (mm)",
+               ["deflection_le_y", "deflection_te_y", "deflection_hinge_y"]),
+              ("deflection_z", "Deflection in z direction over the aileron span", "Deflection (mm)",
+               ["deflection_le_z", "deflection_te_z", "deflection_hinge_z"])]
+
+
+# --- Interactive plots
 
 def plot_internal_forces(internal_z, label):
+    import matplotlib.pyplot as plt
+
     plt.plot(internal_z)
     # plt.scatter([range(len(internal_z))], internal_z)
 
@@ -13,22 +41,21 @@ def plot_internal_forces(internal_z, label):
     plt.show()
 
 
-def plot_3d_aileron(model):
+def plot_3d_aileron(span):
     # 3D plot of aileron discretisation
+    import matplotlib.pyplot as plt
     from mpl_toolkits.mplot3d import Axes3D
 
     fig = plt.figure()
     ax = fig.add_subplot(111, projection='3d')
 
-    x_ss = []
-    y_ss = []
-    z_ss = []
-    for i in range(len(model)):
-        if type(model[i]) is Simple_slice:
-            for boom in model[i].booms:
-                x_ss.append(model[i].x_location)
-                y_ss.append(boom.y_location)
-                z_ss.append(boom.z_location)
+    simple_slices = np.ones(len(span), dtype=bool)
+    simple_slices[span.feature_index] = False
+
+    booms = span.cross_section.booms
+    x_ss = np.repeat(span.x_location[simple_slices], len(booms))
+    y_ss = np.tile([boom.y_location for boom in booms], np.count_nonzero(simple_slices))
+    z_ss = np.tile([boom.z_location for boom in booms], np.count_nonzero(simple_slices))
 
     ax.scatter(x_ss, z_ss, y_ss, c='r', marker='o')
     ax.set_xlabel('X')
@@ -42,6 +69,8 @@ def plot_3d_aileron(model):
 
 
 def plot_le_te_deflection(le_deflection, te_deflection, x_position):
+    import matplotlib.pyplot as plt
+
     plt.plot(x_position, le_deflection, label="Leading edge deflection")
     plt.plot(x_position, te_deflection, label="Trailing edge deflection")
 
@@ -52,3 +81,85 @@ def plot_le_te_deflection(le_deflection, te_deflection, x_position):
     plt.legend()
     plt.grid()
     plt.show()
+
+
+# --- File export (Agg, non-blocking)
+
+def _figure():
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _mark_features(ax, hinges=(), actuators=()):
+    for x in hinges:
+        ax.axvline(x, color="g", linewidth=0.8)
+    for x in actuators:
+        ax.axvline(x, color="y", linewidth=0.8)
+    ax.axhline(0, color="r", linewidth=0.8)
+
+
+def plot_span_features(x_pos, values, hinges=(), actuators=(), path="fig.png", dpi=DPI):
+    """
+    Export a distribution along the span with the hinge (green) and actuator (yellow) locations marked, as drawn
+    by the plot option of the force solvers.
+
+    :param path: Output file, the format follows from its extension
+    :param dpi: Resolution of the file
+    :return: path
+    """
+    figure = _figure()
+    ax = figure.add_subplot(111)
+
+    ax.plot(x_pos, values)
+    _mark_features(ax, hinges, actuators)
+
+    figure.savefig(path, dpi=dpi)
+    return path
+
+
+def export_span_plots(results, directory, dpi=DPI, fmt="png", cfg=None):
+    """
+    Export all span distributions of an analysis in a single pass over the results (see SPAN_PLOTS).
+
+    :param results: Dictionary of result arrays (see analysis.run_analysis, or a loaded results file)
+    :param directory: Output directory (created if needed)
+    :param dpi: Resolution of the files
+    :param fmt: File format ("png", "pdf", "svg", ...)
+    :param cfg: AileronConfig of the results, to mark the hinge and actuator locations (optional)
+    :return: List of the written file paths
+    """
+    os.makedirs(directory, exist_ok=True)
+    x_location = results["x_location"]
+
+    hinges = actuators = ()
+    if cfg is not None:
+        hinges = (cfg.x1, cfg.x2, cfg.x3)
+        actuators = (cfg.x2 - cfg.xa/2, cfg.x2 + cfg.xa/2)
+
+    paths = []
+    for name, title, label, fields in SPAN_PLOTS:
+        fields = [field for field in fields if field in results]
+        if not fields:
+            continue
+
+        figure = _figure()
+        ax = figure.add_subplot(111)
+        for field in fields:
+            ax.plot(x_location, results[field], label=field)
+        _mark_features(ax, hinges, actuators)
+
+        ax.set_title(title)
+        ax.set_xlabel("x position (mm)")
+        ax.set_ylabel(label)
+        ax.grid()
+        if len(fields) > 1:
+            ax.legend()
+
+        paths.append(os.path.join(directory, name + "." + fmt))
+        figure.savefig(paths[-1], dpi=dpi)
+
+    return paths
@@ -0,0 +1,148 @@
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+
+# CONSTANTS #
+ENABLED = os.environ.get("SVV_PROFILE", "0") not in ("", "0")    # SVV_PROFILE=1 enables the instrumentation
+REPORT_PATH = os.environ.get("SVV_PROFILE_OUT")                   # JSON report written at exit when enabled
+
+_timers = {}        # name: [calls, total time, max time]
+_counters = {}      # name: count
+
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def reset():
+    _timers.clear()
+    _counters.clear()
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+
+        entry = _timers.get(self.name)
+        if entry is None:
+            _timers[self.name] = [1, elapsed, elapsed]
+        else:
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+        return False
+
+
+def timer(name):
+    """
+    Context manager timing a named stage, e.g. with timer("Y_force.integration"): ...
+
+    Nested timers all record their own wall time (inclusive of the stages they contain). When profiling is
+    disabled, a shared no-op context is returned.
+    """
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def count(name, n=1):
+    """
+    Add n to a named counter (solver iterations, cache hits, ...), no-op when profiling is disabled.
+    """
+    if ENABLED:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def profiled(function):
+    """
+    Decorator timing every call of a function under its qualified name (e.g. "SpanModel.from_features").
+
+    When profiling is disabled the overhead is one flag check per call.
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return function(*args, **kwargs)
+        with _Timer(name):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def report():
+    """
+    Return the collected timings and counters.
+
+    :return: Dictionary {"timers": {name: {"calls", "total", "mean", "max"}}, "counters": {name: count}}, timers sorted
+             by decreasing total time
+    """
+    timers = {name: {"calls": calls, "total": total, "mean": total/calls, "max": maximum}
+              for name, (calls, total, maximum) in sorted(_timers.items(), key=lambda item: -item[1][1])}
+    return {"timers": timers, "counters": dict(sorted(_counters.items()))}
+
+
+def report_json(path=None):
+    """
+    Return the report as a JSON string, or write it to path.
+    """
+    text = json.dumps(report(), indent=2)
+    if path is None:
+        return text
+
+    with open(path, "w") as file:
+        file.write(text)
+
+
+def report_text():
+    """
+    Return the report as a text table.
+    """
+    data = report()
+    width = max([len(name) for name in list(data["timers"]) + list(data["counters"])] + [5])
+
+    lines = [("%-" + str(width) + "s %8s %12s %12s %12s") % ("Stage", "Calls", "Total [s]", "Mean [s]", "Max [s]")]
+    for name, entry in data["timers"].items():
+        lines.append(("%-" + str(width) + "s %8d %12.6f %12.6f %12.6f")
+                     % (name, entry["calls"], entry["total"], entry["mean"], entry["max"]))
+
+    if data["counters"]:
+        lines.append("")
+        lines.append(("%-" + str(width) + "s %8s") % ("Counter", "Count"))
+        for name, value in data["counters"].items():
+            lines.append(("%-" + str(width) + "s %8d") % (name, value))
+
+    return "\n".join(lines)
+
+
+def _report_at_exit():
+    if not ENABLED or not (_timers or _counters):
+        return
+    print("\n" + report_text(), file=sys.stderr)
+    if REPORT_PATH:
+        report_json(REPORT_PATH)
+
+
+atexit.register(_report_at_exit)
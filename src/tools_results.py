@@ -0,0 +1,132 @@
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from src.tools_cache import cache_key
+
+# CONSTANTS #
+MAGIC = b"SVVRES\x00\x01"
+ALIGNMENT = 64    # [bytes] alignment of the station array and of the records
+
+# --- Station distributions of run_analysis stored by default (one value per station)
+SPAN_FIELDS = ["y_internal_load", "z_internal_load", "y_internal_moment", "z_internal_moment", "x_torque",
+               "displacement_theta", "deflection_le_y", "deflection_le_z", "deflection_te_y", "deflection_te_z",
+               "deflection_hinge_y", "deflection_hinge_z"]
+
+Result_store = namedtuple("Result_store", ["fields", "x_location", "config_hash", "data"])
+
+
+def _record_dtype(n_fields, n_stations):
+    return np.dtype([("config_hash", "S64"), ("data", "<f8", (n_fields, n_stations))], align=True)
+
+
+def _read_header(file):
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a result store: " + str(file.name))
+
+    header_length = int(np.frombuffer(file.read(8), dtype="<u8")[0])
+    header = json.loads(file.read(header_length).decode())
+    return header
+
+
+def create_store(path, x_location, fields=SPAN_FIELDS):
+    """
+    Create an empty result store: a binary file holding one record per design, with every station distribution
+    of the design stored contiguously, so one field of one design is read without loading the rest.
+
+    Layout: magic, header length (uint64), JSON header (field names, number of stations, offsets), station x
+    locations (float64), then the records (config hash, fields x stations float64), all little endian.
+
+    :param path: Output file
+    :param x_location: Station x locations shared by all designs
+    :param fields: Names of the station distributions stored per design (see SPAN_FIELDS)
+    """
+    x_location = np.asarray(x_location, dtype="<f8")
+    fields = list(fields)
+
+    header = {"version": 1, "fields": fields, "n_stations": len(x_location)}
+
+    # --- The offsets depend on the header length, so the header is sized with placeholder offsets first
+    header.update(x_offset=0, data_offset=0)
+    text = json.dumps(header).encode()
+    x_offset = -(-(len(MAGIC) + 8 + len(text) + 32)//ALIGNMENT)*ALIGNMENT
+    data_offset = -(-(x_offset + x_location.nbytes)//ALIGNMENT)*ALIGNMENT
+    header.update(x_offset=x_offset, data_offset=data_offset)
+    text = json.dumps(header).encode().ljust(x_offset - len(MAGIC) - 8)
+
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(np.array([len(text)], dtype="<u8").tobytes())
+        file.write(text)
+        file.write(x_location.tobytes())
+        file.write(b"\x00"*(data_offset - x_offset - x_location.nbytes))
+
+
+def append_results(path, results, cfg):
+    """
+    Append the station distributions of one design to a result store (see create_store).
+
+    :param results: Dictionary of result arrays (see analysis.run_analysis)
+    :param cfg: AileronConfig of the design, stored as its hash (see tools_cache.cache_key)
+    """
+    with open(path, "rb") as file:
+        header = _read_header(file)
+        file.seek(header["x_offset"])
+        x_location = np.frombuffer(file.read(8*header["n_stations"]), dtype="<f8")
+
+    if not np.array_equal(results["x_location"], x_location):
+        raise ValueError("The stations of the design differ from the stations of the result store "
+                         "(the features must be at the same locations, with the same number of slices)")
+
+    record = np.zeros(1, dtype=_record_dtype(len(header["fields"]), header["n_stations"]))
+    record["config_hash"] = cache_key(cfg)
+    for i, name in enumerate(header["fields"]):
+        record["data"][0, i] = results[name]
+
+    with open(path, "ab") as file:
+        file.write(record.tobytes())
+
+
+def open_store(path):
+    """
+    Open a result store for reading, memory-mapping the records: only the slices actually used are read from disk,
+    e.g. open_store(path).data[k, fields.index("x_torque")] for the torque of design k.
+
+    :return: Result_store named tuple (field names, station x locations, config hashes (designs), memory-mapped data
+             (designs x fields x stations))
+    """
+    with open(path, "rb") as file:
+        header = _read_header(file)
+
+    fields = header["fields"]
+    dtype = _record_dtype(len(fields), header["n_stations"])
+    n_designs = (os.path.getsize(path) - header["data_offset"])//dtype.itemsize
+
+    x_location = np.memmap(path, dtype="<f8", mode="r", offset=header["x_offset"], shape=(header["n_stations"],))
+
+    if n_designs == 0:
+        return Result_store(fields, x_location, np.empty(0, dtype="S64"),
+                            np.empty((0, len(fields), header["n_stations"])))
+
+    records = np.memmap(path, dtype=dtype, mode="r", offset=header["data_offset"], shape=(n_designs,))
+    return Result_store(fields, x_location, records["config_hash"], records["data"])
+
+
+def read_field(path, name, design=None):
+    """
+    Read one station distribution from a result store, for one design or for all of them.
+
+    :param name: Field name (see SPAN_FIELDS)
+    :param design: Design number (order of appending), None for all designs
+    :return: Array of the field values (stations, or designs x stations)
+    """
+    store = open_store(path)
+    if name not in store.fields:
+        raise KeyError("No field " + repr(name) + " in the result store")
+
+    field = store.fields.index(name)
+    if design is None:
+        return np.array(store.data[:, field])
+    return np.array(store.data[design, field])
@@ -0,0 +1,72 @@
+import numpy as np
+from collections import namedtuple
+
+from src.shear_flow_calculations import shear_flow_field
+from src.stress_calculations import Stress_peak, direct_stress_field
+from src.tools_profiling import timer
+
+Stress_block = namedtuple("Stress_block", ["start", "stop", "von_mises", "peak", "max_shear_flow",
+                                           "max_direct_stress", "min_direct_stress"])
+
+
+def von_mises_blocks(cross_section, Sy, Sz, My, Mz, Tx, x_pos=None, block_size=100000):
+    """
+    Evaluate the Von Mises stress at every stress point of the span, one block of stations at a time.
+
+    The stress points are the booms (direct stress only) followed by the panels (direct stress averaged over the
+    two end booms, shear stress q/t). Only one block of stresses is held in memory at a time, so the span can be
+    discretised into millions of stations.
+
+    :param cross_section: Cross_section instance
+    :param Sy, Sz, My, Mz: Shear forces and bending moments in the cross-section axes (arrays over the stations)
+    :param Tx: Torque (array over the stations)
+    :param x_pos: Station x locations, used to locate the peak (optional)
+    :param block_size: Number of stations per block
+    :return: Generator of Stress_block (first and last + 1 station, Von Mises stresses (block stations x stress
+             points), running maximum as a Stress_peak of the stations evaluated so far, running maximum absolute
+             panel shear flow and maximum and minimum boom direct stress of the stations evaluated so far)
+    """
+    Sy, Sz, My, Mz, Tx = [np.asarray(load) for load in (Sy, Sz, My, Mz, Tx)]
+    n_stations = len(Sy)
+
+    n_booms = len(cross_section.booms)
+    n_panels = len(cross_section.panels)
+
+    peak = None
+    max_shear_flow = 0.
+    max_direct_stress = min_direct_stress = 0.
+
+    for start in range(0, n_stations, block_size):
+        stop = min(start + block_size, n_stations)
+
+        with timer("von_mises_blocks.block"):
+            sigma = direct_stress_field(cross_section, My[start:stop], Mz[start:stop])
+            q = shear_flow_field(cross_section, Sy[start:stop], Sz[start:stop], Tx[start:stop])
+            tau = q/cross_section.panel_thickness
+            sigma_panel = 0.5*(sigma[:, cross_section.panel_start] + sigma[:, cross_section.panel_end])
+
+            von_mises = np.empty((stop - start, n_booms + n_panels))
+            np.abs(sigma, out=von_mises[:, :n_booms])
+            von_mises[:, n_booms:] = np.sqrt(sigma_panel**2 + 3.0*tau**2)
+
+            # --- Running maximum
+            station, point = np.unravel_index(np.argmax(von_mises), von_mises.shape)
+            if peak is None or von_mises[station, point] > peak.value:
+                peak = Stress_peak(von_mises[station, point], start + station,
+                                   None if x_pos is None else x_pos[start + station], point)
+
+            max_shear_flow = max(max_shear_flow, np.abs(q).max())
+            max_direct_stress = max(max_direct_stress, sigma.max())
+            min_direct_stress = min(min_direct_stress, sigma.min())
+
+        yield Stress_block(start, stop, von_mises, peak, max_shear_flow, max_direct_stress, min_direct_stress)
+
+
+def von_mises_peak(cross_section, Sy, Sz, My, Mz, Tx, x_pos=None, block_size=100000):
+    """
+    Return the maximum Von Mises stress over the span (Stress_peak), streaming through von_mises_blocks.
+    """
+    peak = None
+    for block in von_mises_blocks(cross_section, Sy, Sz, My, Mz, Tx, x_pos, block_size):
+        peak = block.peak
+    return peak
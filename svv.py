@@ -0,0 +1,120 @@
+"""
+Headless batch runner of the aileron analysis.
+
+    python -m svv run --config config.py --out results.npz
+    python -m svv run --set theta=28 --set q=6.5 --grid adaptive --out results.npz
+    python -m svv run --out results.npz --plots plots --dpi 300
+    python -m svv run --set q=6.5 --out results.npz --store sweep.svv
+    python -m svv run --out results.npz --fields
+
+Runs the full pipeline (reaction forces, internal loads, torque and twist, stresses, deflections and rib shear
+flows) without any GUI and writes all span arrays, peak stresses and rib shear flows to a compressed .npz file, plus
+the full panel shear flow and boom direct stress fields with --fields. matplotlib is only imported when the span plots
+are exported (--plots).
+
+Exit codes: 0 on success, 1 when an iterative solver does not converge, 2 on invalid arguments or configuration.
+"""
+import argparse
+import os
+import sys
+from dataclasses import fields
+
+import numpy as np
+
+from src.class_CONFIG import AileronConfig
+
+
+def _parse_overrides(cfg, overrides, parser):
+    types = {field.name: field.type for field in fields(AileronConfig)}
+    changes = {}
+
+    for override in overrides:
+        name, _, value = override.partition("=")
+        if name not in types or not value:
+            parser.error("invalid --set " + repr(override) + ", expected one of " + ", ".join(types) + " as name=value")
+        try:
+            changes[name] = (int if types[name] in (int, "int") else float)(value)
+        except ValueError:
+            parser.error("invalid value in --set " + repr(override))
+
+    try:
+        return cfg.replace(**changes)
+    except ValueError as error:
+        parser.error("invalid configuration: " + str(error))
+
+
+def run(args, parser):
+    # --- Imported here, so that argument errors do not pay for the solver imports
+    from src.analysis import run_analysis
+    from src.force_calculations_v2 import ConvergenceError
+    from src.tools_mesh import adaptive_mesh
+    from src.tools_results import create_store, append_results
+
+    try:
+        cfg = AileronConfig.from_file(args.config) if args.config else AileronConfig.from_module()
+    except (OSError, AttributeError, SyntaxError, ValueError) as error:
+        parser.error("cannot load the configuration: " + str(error))
+    cfg = _parse_overrides(cfg, args.set, parser)
+
+    grid = adaptive_mesh(cfg) if args.grid == "adaptive" else None
+
+    try:
+        results = run_analysis(cfg, nb_of_slices=args.slices, n_steps=args.n_steps, method=args.method,
+                               cache=not args.no_cache, grid=grid, fields=args.fields)
+    except ConvergenceError as error:
+        print("svv: solver did not converge: " + str(error), file=sys.stderr)
+        return 1
+
+    np.savez_compressed(args.out, **results)
+
+    if args.store:
+        if not os.path.exists(args.store):
+            create_store(args.store, results["x_location"])
+        try:
+            append_results(args.store, results, cfg)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.plots:
+        from src.tools_plot import export_span_plots
+        export_span_plots(results, args.plots, dpi=args.dpi, fmt=args.plot_format, cfg=cfg)
+
+    if not args.quiet:
+        print("Analysed " + str(len(results["x_location"])) + " stations, results written to " + args.out)
+        print("Peak Von Mises stress: " + "%.1f" % results["max_von_mises"] + " MPa")
+
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="svv", description="Aileron structural analysis")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the full analysis and write the results")
+    run_parser.add_argument("--config", help="Python configuration file (config.py by default)")
+    run_parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                            help="override a configuration value (repeatable)")
+    run_parser.add_argument("--out", default="results.npz", help="output file (.npz)")
+    run_parser.add_argument("--slices", type=int, help="number of simple slices (configuration value by default)")
+    run_parser.add_argument("--grid", choices=["uniform", "adaptive"], default="uniform",
+                            help="span discretisation")
+    run_parser.add_argument("--method", choices=["direct", "iterative"], default="direct",
+                            help="reaction force solver")
+    run_parser.add_argument("--n-steps", type=int, default=10000, help="integration steps of the iterative solvers")
+    run_parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk result cache")
+    run_parser.add_argument("--fields", action="store_true",
+                            help="also write the panel shear flow and boom direct stress at every station")
+    run_parser.add_argument("--store", help="result store the span distributions are appended to (created if needed)")
+    run_parser.add_argument("--plots", metavar="DIRECTORY", help="export the span plots to this directory")
+    run_parser.add_argument("--dpi", type=int, default=150, help="resolution of the exported plots")
+    run_parser.add_argument("--plot-format", default="png", help="file format of the exported plots")
+    run_parser.add_argument("--quiet", action="store_true", help="no summary output")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        return run(args, parser)
+
+
+if __name__ == "__main__":
+    sys.exit(main())